@@ -7,322 +7,30 @@
 import webbrowser
 import os
 import sys
+import csv
+import json
 from collections import deque
-
-# First-Come, First-Served (FIFO)
-class Process:
-    def __init__(self, name: str, arrival: int, burst: int):
-        self.name = name
-        self.arrival = arrival
-        self.burst = burst
-        self.remaining_burst = burst
-        self.start_time = None
-        self.finish_time = None
-
-    def __repr__(self):
-        return f"Process(name='{self.name}', arrival={self.arrival}, burst={self.burst})"
-
-def calculate_metrics(processes, runtime):
-    metrics = []
-    for process in processes:
-        if process.start_time is None:
-            metrics.append(f"{process.name} was never selected")
-        elif process.finish_time is None or process.finish_time > runtime:
-            metrics.append(f"{process.name} did not finish")
-        else:
-            # Fix the calculation of wait time
-            wait_time = process.finish_time - process.arrival - process.burst
-            turnaround_time = process.finish_time - process.arrival
-            response_time = process.start_time - process.arrival
-            # Manually set the white spaces
-            metrics.append(f"{process.name} {format('wait', wait_time)} {format('turnaround', turnaround_time)} {format('response', response_time)}")
-    return metrics
-
-# manually adding the function below to take care of the white space 
-def format(string, number): 
-    if string == "processes":
-        number_str = str(number)
-        if len(number_str) == 1:
-            spaces = "  "
-        elif len(number_str) == 2:
-            spaces = " "
-        else:
-            spaces = ""
-        return f"{spaces}{number} {string}"
-    
-    number_str = str(number)
-    if len(number_str) == 1:
-        spaces = "   "
-    elif len(number_str) == 2:
-        spaces = "  "
-    else:
-        spaces = " "
-    return f"{string}{spaces}{number}"
-
-
-def fifo_scheduling(processes, runtime):
-    output = []
-    
-    # Add the number of processes and the scheduling algorithm being used to the output
-    # HUMAN COMMENT: Faramarz manually fixed the white spaces
-    output.append(format('processes', len(processes)))
-    output.append("Using First-Come First-Served")
-
-    # Create a copy of the processes list and sort the copy by arrival time
-    sorted_processes = sorted(processes, key=lambda x: x.arrival)
-    current_time = 0
-    event_log = []
-
-    for process in sorted_processes:
-        # Record the arrival event
-        event_log.append((process.arrival, 'arrived', process.name))
-
-        # If the current time is less than the process's arrival time, wait until it arrives
-        if current_time < process.arrival:
-            current_time = process.arrival
-
-        # Record the start and finish times
-        process.start_time = current_time
-        process.finish_time = process.start_time + process.burst
-
-        # Record the time the process is selected and finished
-        event_log.append((process.start_time, 'selected', process.name, process.burst))
-        event_log.append((process.finish_time, 'finished', process.name))
-
-        # Update current time
-        current_time = process.finish_time
-
-    # Sort events by time and priority
-    event_log.sort(key=lambda x: (x[0], {'arrived': 0, 'finished': 1, 'selected': 2}[x[1]]))
-
-    # Add the timeline as a table to the output
-    selected_processes = set()
-    for time in range(runtime):
-        events_at_time = [event for event in event_log if event[0] == time]
-        if events_at_time:
-            for event in events_at_time:
-                if event[1] == 'arrived':
-                    output.append(f"{format('Time', time)} : {event[2]} {event[1]}")
-                elif event[1] == 'finished':
-                    selected_processes.discard(event[2])
-                    output.append(f"{format('Time',time)} : {event[2]} {event[1]}")
-                    # Check if the scheduler will be idle at the next time tick
-                    # HUMAN COMMENT: Megan modified the logic on the line below. The AI generated
-                    # code was producing incorrect output as it would print Idle even if the
-                    # system was not going to become idle. Instead of checking to find if any
-                    # number of events occur at a time, we check to see if exactly one event
-                    # occurs at the time.
-                    if [e[0] for e in event_log].count(time) == 1 and not selected_processes:
-                        output.append(f"{format('Time', time)} : Idle")
-                elif event[1] == 'selected':
-                    selected_processes.add(event[2])
-                    output.append(f"{format('Time', time)} : {event[2]} {event[1]} (burst   {event[3]})")
-        else:
-            if not selected_processes:
-                output.append(f"{format('Time', time)} : Idle")
-
-    output.append(f"Finished at time  {runtime}\n")
-
-    # Calculate and add wait time, turnaround time, and response time for each process to the output
-    output.extend(calculate_metrics(processes, runtime))
-
-    return output
-
-# Pre-emptive Shortest Job First (SJF)
-def preemptive_sjf(original_processes, runtime):
-    output = []
-    
-    # HUMAN COMMENT: Faramarz manually fixed the white space
-    # Add the number of processes and the scheduling algorithm being used to the output
-    output.append(format('processes', len(original_processes)))
-    output.append("Using preemptive Shortest Job First")
-
-    # Create a copy of the processes list and sort the copy by arrival time
-    processes = original_processes.copy()
-    processes.sort(key=lambda x: x.arrival)
-    current_time = 0
-    ready_queue = []
-    current_process = None
-    event_log = []
-
-    while current_time < runtime:
-        # Handle arriving processes
-        while processes and processes[0].arrival <= current_time:
-            process = processes.pop(0)
-            ready_queue.append(process)
-            event_log.append((current_time, 'arrived', process.name))
-
-        # Sort ready queue by remaining burst time and possibly preempt current process
-        if ready_queue:
-            ready_queue.sort(key=lambda x: x.remaining_burst)
-            if not current_process or (ready_queue and ready_queue[0].remaining_burst < current_process.remaining_burst):
-                if current_process:
-                    ready_queue.append(current_process)
-                current_process = ready_queue.pop(0)
-                if current_process.start_time is None:
-                    current_process.start_time = current_time
-                event_log.append((current_time, 'selected', current_process.name, current_process.remaining_burst))
-
-        # Execute current process
-        if current_process:
-            current_process.remaining_burst -= 1
-            if current_process.remaining_burst == 0:
-                current_process.finish_time = current_time + 1
-                event_log.append((current_time + 1, 'finished', current_process.name))
-                current_process = None
-
-        # Move time forward
-        current_time += 1
-
-        # Check if the system is idle
-        if current_process is None and not ready_queue and not any(process.arrival <= current_time for process in processes):
-            event_log.append((current_time, 'idle'))
-
-    # Sort events by time and priority
-    event_log.sort(key=lambda x: (x[0], {'arrived': 0, 'finished': 1, 'selected': 2, 'idle': 3}[x[1]]))
-
-    # Add the timeline as a table to the output
-    for time in range(runtime):
-        events_at_time = [event for event in event_log if event[0] == time]
-        if events_at_time:
-            for event in events_at_time:
-                if event[1] == 'arrived':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]}")
-                elif event[1] == 'finished':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]}")
-                elif event[1] == 'selected':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]} (burst {event[3]:3d})")
-                elif event[1] == 'idle':
-                    output.append(f"Time {time:3d} : Idle")
-
-    output.append(f"Finished at time {runtime:3d}\n")
-
-    # Calculate and add wait time, turnaround time, and response time for each process to the output
-    metrics = calculate_metrics(original_processes, runtime)
-    output.extend(metrics)
-
-    return output
-
-# Round Robin (RR)
-def round_robin_scheduling(processes, time_slice, run_for):
-    queue = deque()
-    processes.sort(key=lambda x: x.arrival)
-    time = 0 # Start time at 0
-    scheduled = []
-    process_map = {p.name: p for p in processes}
-
-    while time < run_for:
-        # Add all processes that have arrived by the current time to the queue
-        while processes and processes[0].arrival <= time:
-            arriving_process = processes.pop(0)
-            scheduled.append((time, arriving_process.name, "arrived"))
-            queue.append(arriving_process)
-
-        if queue:
-            current_process = queue.popleft()
-            if current_process.start_time is None:
-                current_process.start_time = time
-
-            run_time = min(current_process.remaining_burst, time_slice)
-            scheduled.append((time, current_process.name, "selected", current_process.remaining_burst))
-
-            # Execute the current process for the time slice or until it finishes
-            for _ in range(run_time):
-                time += 1
-                current_process.remaining_burst -= 1
-
-                # Check for newly arriving processes during execution
-                while processes and processes[0].arrival <= time:
-                    arriving_process = processes.pop(0)
-                    scheduled.append((time, arriving_process.name, "arrived"))
-                    queue.append(arriving_process)
-
-                # If the current time exceeds the run_for limit, stop execution
-                if time >= run_for:
-                    break
-
-            if current_process.remaining_burst == 0:
-                current_process.finish_time = time
-                scheduled.append((time, current_process.name, "finished"))
-                if time < run_for and (not queue and not any(process.arrival <= time for process in processes)):
-                    scheduled.append((time, "Idle"))  # Add idle only if no process is ready to run
-            else:
-                queue.append(current_process)
-        else:
-            if processes:
-                time = processes[0].arrival
-            else:
-                time += 1
-                if time < run_for:  # Ensure Idle is added only within the run_for time
-                    scheduled.append((time, "Idle"))
-
-    return scheduled, time, process_map
-
-def print_scheduling(scheduled, total_time, processes, run_for, process_map=None):
-    for event in scheduled:
-        if len(event) == 2 and event[1] == "Idle":
-            print(f"Time {event[0]:>3} : Idle")
-        elif event[2] == "arrived":
-            print(f"Time {event[0]:>3} : {event[1]} arrived")
-        elif event[2] == "selected":
-            print(f"Time {event[0]:>3} : {event[1]} selected (burst {event[3]:>3})")
-        elif event[2] == "finished":
-            print(f"Time {event[0]:>3} : {event[1]} finished")
-            process = next((p for p in processes if p.name == event[1]), None)
-            if process:
-                wait_time = (process.finish_time - process.arrival - process.burst)
-                turnaround_time = process.finish_time - process.arrival
-                response_time = process.start_time - process.arrival
-                print(f"{process.name} wait   {wait_time:>3} turnaround   {turnaround_time:>3} response   {response_time:>3}")
-    
-    if total_time < run_for:
-        print(f"Time {total_time}: Idle")
-    print(f"Finished at time {run_for}\n")
-
-    if process_map:
-        for p in sorted(process_map.values(), key=lambda x: x.name):
-            wait_time = (p.finish_time - p.arrival - p.burst)
-            turnaround_time = p.finish_time - p.arrival
-            response_time = p.start_time - p.arrival
-            print(f"{p.name} {format('wait', wait_time)} {format('turnaround', turnaround_time)} {format('response', response_time)}")
-            
-            
-def parse_input_file(filename):
-    processes = []
-    runtime = None
-    scheduling_algorithm = None
-    time_slice = None
-
-    with open(filename, 'r') as file:
-        for line in file:
-            parts = line.split()
-            if parts[0] == 'processcount':
-                process_count = int(parts[1])
-            elif parts[0] == 'runfor':
-                runtime = int(parts[1])
-            elif parts[0] == 'use':
-                scheduling_algorithm = parts[1]
-            elif parts[0] == 'quantum':
-                time_slice = int(parts[1])
-            elif parts[0] == 'process':
-                name = parts[2]
-                arrival = int(parts[4])
-                burst = int(parts[6])
-                processes.append(Process(name, arrival, burst))
-            elif parts[0] == 'end':
-                break
-
-    return processes, runtime, scheduling_algorithm, time_slice
-
-def write_output_file(filename, output):
-    output_file = filename.split('.')[0] + '.out'
-    html_file = filename.split('.')[0] + '.html'
-
-    with open(output_file, 'w') as file:
-        file.write('\n'.join(output))
-        file.write('\n')
-
-    html_output = """
+from contextlib import ExitStack
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine import RunState, algorithm_options, get_algorithm, make_processes
+from input_parser import read_workload
+from metrics import DID_NOT_FINISH, FINISHED, NEVER_SELECTED, process_metrics, summarize
+from report import event_text, render_events, report_footer, report_header
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+# Files a run can produce, next to the input: the .out text, the HTML report, the
+# summary metrics as JSON and the per-process metrics as CSV
+REPORT_FORMATS = ('out', 'html', 'json', 'csv')
+DEFAULT_FORMATS = ('out', 'html')
+CSV_FIELDS = ['name', 'arrival', 'burst', 'status', 'wait', 'turnaround', 'response']
+STATUS_NAMES = {FINISHED: 'finished', DID_NOT_FINISH: 'did not finish', NEVER_SELECTED: 'never selected'}
+
+HTML_HEAD = """
     <html>
     <head>
         <title>Scheduling Results</title>
@@ -346,154 +54,301 @@ def write_output_file(filename, output):
             tr:nth-child(even) {
                 background-color: #f9f9f9;
             }
-        </style>
-    </head>
-    <body>
-        <h1>Scheduling Results</h1>
-        <table>
-            <tr>
-                <th>Time</th>
-                <th>Event</th>
-            </tr>
-    """
-    
-    for line in output:
-        if line.startswith("Time") or "Idle" in line:
-            parts = line.split(':')
-            html_output += f"<tr><td>{parts[0]}</td><td>{parts[1]}</td></tr>\n"
-        else:
-            html_output += f"<tr><td colspan='2'>{line}</td></tr>\n"
-
-    html_output += "</table></body></html>"
-
-    with open(html_file, 'w') as file:
-        file.write(html_output)
-
-    return os.path.abspath(html_file)
-
-
-def write_scheduling_to_file(file, scheduled, total_time, processes, run_for, process_map=None):
-    html_output = """
-    <html>
-    <head>
-        <title>Scheduling Results</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                margin: 20px;
+            /* Pages of the timeline that are off screen are not laid out until scrolled to */
+            .page {
+                content-visibility: auto;
+                contain-intrinsic-size: auto 175000px;
             }
-            table {
+            .gantt {
                 width: 100%;
-                border-collapse: collapse;
-            }
-            th, td {
-                padding: 8px;
-                text-align: left;
-                border-bottom: 1px solid #ddd;
-            }
-            th {
-                background-color: #f2f2f2;
+                height: 48px;
+                border: 1px solid #ddd;
             }
-            tr:nth-child(even) {
-                background-color: #f9f9f9;
+            .axis {
+                display: flex;
+                justify-content: space-between;
             }
         </style>
     </head>
     <body>
         <h1>Scheduling Results</h1>
-        <table>
-            <tr>
-                <th>Time</th>
-                <th>Event</th>
-            </tr>
-    """
-
-    for event in scheduled:
-        if len(event) == 2 and event[1] == "Idle":
-            file.write(f"Time {event[0]:>3} : Idle\n")
-            html_output += f"<tr><td>{event[0]:>3}</td><td>Idle</td></tr>\n"
-        elif event[2] == "arrived":
-            file.write(f"Time {event[0]:>3} : {event[1]} arrived\n")
-            html_output += f"<tr><td>{event[0]:>3}</td><td>{event[1]} arrived</td></tr>\n"
-        elif event[2] == "selected":
-            file.write(f"Time {event[0]:>3} : {event[1]} selected (burst {event[3]:>3})\n")
-            html_output += f"<tr><td>{event[0]:>3}</td><td>{event[1]} selected (burst {event[3]:>3})</td></tr>\n"
-        elif event[2] == "finished":
-            file.write(f"Time {event[0]:>3} : {event[1]} finished\n")
-            html_output += f"<tr><td>{event[0]:>3}</td><td>{event[1]} finished</td></tr>\n"
-            process = next((p for p in processes if p.name == event[1]), None)
-            if process:
-                wait_time = (process.finish_time - process.arrival - process.burst)
-                turnaround_time = process.finish_time - process.arrival
-                response_time = process.start_time - process.arrival
-                file.write(f"{process.name} wait {wait_time:>3} turnaround {turnaround_time:>3} response {response_time:>3}\n")
-                html_output += f"<tr><td colspan='2'>{process.name} wait {wait_time:>3} turnaround {turnaround_time:>3} response {response_time:>3}</td></tr>\n"
-    
-    if total_time < run_for:
-        file.write(f"Time {total_time}: Idle\n")
-        html_output += f"<tr><td>{total_time}</td><td>Idle</td></tr>\n"
-    file.write(f"Finished at time  {run_for}\n\n")
-    html_output += f"<tr><td colspan='2'>Finished at time {run_for}</td></tr>\n"
-
-    html_output += "</table>"
-
-    if process_map:
-        html_output += """
-        <h2>Process Metrics</h2>
-        <table>
-            <tr>
-                <th>Process</th>
-                <th>Wait Time</th>
-                <th>Turnaround Time</th>
-                <th>Response Time</th>
-            </tr>
-        """
-        for p in sorted(process_map.values(), key=lambda x: x.name):
-            wait_time = (p.finish_time - p.arrival - p.burst)
-            turnaround_time = p.finish_time - p.arrival
-            response_time = p.start_time - p.arrival
-            file.write(f"{p.name} {format('wait', wait_time)} {format('turnaround', turnaround_time)} {format('response', response_time)}\n")
-            html_output += f"<tr><td>{p.name}</td><td>{wait_time}</td><td>{turnaround_time}</td><td>{response_time}</td></tr>\n"
-
-        html_output += "</table>\n"
-
-    html_output += "</body>\n</html>"
-
-    # Write the HTML output to a file
-    html_file = file.name.replace('.out', '.html')
-    with open(html_file, 'w') as f:
-        f.write(html_output)
-
-    return os.path.abspath(html_file)
+        <p><a href="#gantt">Gantt chart</a></p>
+"""
+TIMELINE_HEADER = "<tr><th>Time</th><th>Event</th></tr>\n"
+METRICS_HEADER = "<tr><th>Process</th><th>Wait Time</th><th>Turnaround Time</th><th>Response Time</th></tr>\n"
+# Timeline rows per page; each page is its own table, written to the file in one go
+HTML_PAGE_ROWS = 5000
+IDLE_COLOUR = '#cccccc'
+
+
+class Gantt:
+    # Run-length view of the timeline: one (start, end, name) interval per stretch
+    # of CPU time a process held without a switch, and one interval with name None
+    # for each gap between them, however many Idle ticks it spans. Built in one pass
+    # as the events go by, so its size follows the number of context switches, not
+    # the number of ticks.
+    def __init__(self):
+        self.intervals = []
+        self._running = None
+        self._since = None
+        # End of the last interval
+        self._end = 0
+
+    def selected(self, time, name, burst):
+        # A process picked again right after its own quantum keeps its interval, and
+        # one picked with no burst left (FCFS logs those after they finish) runs for no time
+        if name != self._running:
+            self._close(time)
+            if burst > 0:
+                if time > self._end:
+                    self.intervals.append((self._end, time, None))
+                self._running, self._since = name, time
+
+    def finished(self, time, name):
+        if name == self._running:
+            self._close(time)
+
+    def _close(self, time):
+        if self._running is not None and time > self._since:
+            self.intervals.append((self._since, time, self._running))
+            self._end = time
+        self._running = None
+
+    def end(self, runtime):
+        # Whatever still holds the CPU at the end of the run is cut off there
+        self._close(runtime)
+        if runtime > self._end:
+            self.intervals.append((self._end, runtime, None))
+            self._end = runtime
+
+
+class HtmlReport:
+    # Streams the HTML report to a file instead of building it up as one string.
+    # Rows are buffered a page at a time, so memory stays flat however long the
+    # trace is, and the browser only lays out the pages that are on screen.
+    # Consecutive Idle ticks share one row, and the CPU timeline is drawn as an
+    # SVG Gantt chart at the end of the report.
+    def __init__(self, path, runtime):
+        self.path = os.path.abspath(path)
+        self.runtime = runtime
+        self.gantt = Gantt()
+        self._file = open(path, 'w', buffering=OUTPUT_BUFFER_SIZE)
+        self._file.write(HTML_HEAD)
+        self._rows = []
+        # [start, end) of the idle ticks not written out yet
+        self._idle = None
+
+    def record(self, events, processes, scheduling_algorithm):
+        # Pass the event records through, adding each one to the report on the way
+        names = [p.name for p in processes]
+        for event in events:
+            time, kind, pid, value = event
+            if kind == 'idle':
+                self.idle(time, value)
+            elif kind == 'selected':
+                self.selected(time, names[pid], value, event_text(kind, names[pid], value, scheduling_algorithm))
+            elif kind == 'finished':
+                self.finished(time, names[pid], event_text(kind, names[pid], value, scheduling_algorithm))
+            else:
+                self.row(time, event_text(kind, names[pid], value, scheduling_algorithm))
+            yield event
+
+    def selected(self, time, name, burst, event):
+        self.gantt.selected(time, name, burst)
+        self.row(time, event)
+
+    def finished(self, time, name, event):
+        self.gantt.finished(time, name)
+        self.row(time, event)
+
+    def idle(self, start, end=None):
+        # Idle from start up to end, or for the single tick at start
+        end = start + 1 if end is None else end
+        if self._idle is not None and self._idle[1] == start:
+            self._idle[1] = end
+        else:
+            self._write_idle()
+            self._idle = [start, end]
+
+    def _write_idle(self):
+        if self._idle is not None:
+            start, end = self._idle
+            self._idle = None
+            self.row(start if end - start == 1 else f"{start} - {end - 1}", "Idle")
+
+    def row(self, time, event):
+        self._write_idle()
+        self._rows.append(f"<tr><td>{time}</td><td>{event}</td></tr>\n")
+        if len(self._rows) >= HTML_PAGE_ROWS:
+            self._write_page()
+
+    def note(self, text):
+        self._write_idle()
+        self._rows.append(f"<tr><td colspan='2'>{text}</td></tr>\n")
+        if len(self._rows) >= HTML_PAGE_ROWS:
+            self._write_page()
+
+    def _write_page(self):
+        if self._rows:
+            self._file.write(f"<div class='page'><table>\n{TIMELINE_HEADER}")
+            self._file.writelines(self._rows)
+            self._file.write("</table></div>\n")
+            self._rows.clear()
+
+    def metrics(self, rows):
+        # rows of (name, status, wait, turnaround, response), after the timeline. The
+        # times of a process that did not finish are replaced by its status.
+        self._write_idle()
+        self._write_page()
+        self._file.write(f"<h2>Process Metrics</h2>\n<table>\n{METRICS_HEADER}")
+        self._file.writelines(f"<tr><td>{name}</td><td>{wait}</td><td>{turnaround}</td><td>{response}</td></tr>\n"
+                              if status == FINISHED else f"<tr><td>{name}</td><td colspan='3'>{STATUS_NAMES[status]}</td></tr>\n"
+                              for name, status, wait, turnaround, response in rows)
+        self._file.write("</table>\n")
+
+    def _write_gantt(self):
+        self.gantt.end(self.runtime)
+        # Every process keeps one colour, spread around the hue circle in order of first use
+        hues = {}
+        def fill(name):
+            if name is None:
+                return IDLE_COLOUR
+            hue = hues.setdefault(name, len(hues) * 137.5 % 360)
+            return f"hsl({hue:.1f}, 65%, 55%)"
+
+        self._file.write(f"<h2 id='gantt'>Gantt Chart</h2>\n"
+                         f"<svg class='gantt' viewBox='0 0 {max(self.runtime, 1)} 1' preserveAspectRatio='none' shape-rendering='crispEdges'>\n")
+        self._file.writelines(f"<rect x='{start}' width='{end - start}' height='1' fill='{fill(name)}'><title>{name or 'Idle'} {start} - {end}</title></rect>\n"
+                              for start, end, name in self.gantt.intervals)
+        self._file.write(f"</svg>\n<div class='axis'><span>0</span><span>{self.runtime}</span></div>\n")
+
+    def close(self):
+        self._write_idle()
+        self._write_page()
+        self._write_gantt()
+        self._file.write("</body>\n</html>\n")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_outputs(stack, filename, runtime, formats):
+    # The .out file and the HtmlReport for a run, each None unless its format was asked for
+    base = filename.split('.')[0]
+    file = stack.enter_context(open(base + '.out', 'w', buffering=OUTPUT_BUFFER_SIZE)) if 'out' in formats else None
+    report = stack.enter_context(HtmlReport(base + '.html', runtime)) if 'html' in formats else None
+    return file, report
+
+
+def write_report(filename, processes, runtime, scheduling_algorithm, time_slice, state, events, formats):
+    # Write the .out text and the HTML report of a run together, in one pass over its
+    # event records. The .out is the one scheduler-gpt.py writes; the HTML report
+    # has the same timeline and then the metrics as a table.
+    with ExitStack() as stack:
+        file, report = open_outputs(stack, filename, runtime, formats)
+        header = list(report_header(processes, scheduling_algorithm, time_slice))
+        if report is not None:
+            for line in header:
+                report.note(line)
+            events = report.record(events, processes, scheduling_algorithm)
+        if file is not None:
+            file.writelines(f"{line}\n" for line in header)
+            file.writelines(render_events(events, processes, scheduling_algorithm, end='\n'))
+        else:
+            # The run state is still wanted for the metrics
+            deque(events, maxlen=0)
+
+        if report is not None:
+            report.note(f"Finished at time {runtime}")
+            columns = process_metrics(processes, runtime, state)
+            if np is not None:
+                columns = {name: column.tolist() for name, column in columns.items()}
+            report.metrics(zip((p.name for p in processes), columns['status'], columns['wait'], columns['turnaround'], columns['response']))
+        if file is not None:
+            file.writelines(f"{line}\n" for line in report_footer(processes, runtime, scheduling_algorithm, state))
+
+    return report.path if report is not None else None
+
+
+def write_metrics_files(filename, processes, runtime, scheduling_algorithm, time_slice, state, formats):
+    # The .json summary and .csv per-process table, for the formats that were asked for
+    base = filename.split('.')[0]
+    columns = process_metrics(processes, runtime, state)
+    if 'json' in formats:
+        document = {
+            'input': filename,
+            'algorithm': scheduling_algorithm,
+            'quantum': time_slice,
+            'runfor': runtime,
+            'summary': summarize(processes, runtime, columns),
+        }
+        with open(base + '.json', 'w') as file:
+            json.dump(document, file, indent=2)
+            file.write('\n')
+    if 'csv' in formats:
+        if np is not None:
+            columns = {name: column.tolist() for name, column in columns.items()}
+        with open(base + '.csv', 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            for p, status, wait_time, turnaround_time, response_time in zip(processes, columns['status'], columns['wait'], columns['turnaround'], columns['response']):
+                # Times that do not apply to a process are left empty
+                finished = status == FINISHED
+                writer.writerow([p.name, p.arrival, p.burst, STATUS_NAMES[status],
+                                 wait_time if finished else '', turnaround_time if finished else '',
+                                 response_time if status != NEVER_SELECTED else ''])
+
+
+def parse_options(args):
+    # (formats, open_browser) from the flags after the input file, or None if they are not valid
+    formats, open_browser = DEFAULT_FORMATS, True
+    args = iter(args)
+    for arg in args:
+        if arg == '--no-open':
+            open_browser = False
+        elif arg == '--format':
+            formats = tuple(next(args, '').split(','))
+            if any(name not in REPORT_FORMATS for name in formats):
+                return None
+        else:
+            return None
+    return formats, open_browser
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scheduler.py <input_file>")
+    options = parse_options(sys.argv[2:])
+    if len(sys.argv) < 2 or options is None:
+        print("Usage: python scheduler.py <input_file> [--format out,html,json,csv] [--no-open]")
         return
+    # Only the files named by --format are produced, and the browser is only
+    # opened when there is an HTML report and --no-open was not given
+    formats, open_browser = options
 
     input_file = sys.argv[1]
-    processes, runtime, scheduling_algorithm, time_slice = parse_input_file(input_file)
+    try:
+        workload = read_workload(input_file)
+    except ValueError as error:
+        print("Invalid input file:", error)
+        return
+    try:
+        # The algorithm's own settings, such as the quanta of mlfq
+        settings = algorithm_options(workload)
+    except ValueError as error:
+        print(error)
+        return
+    processes, runtime, scheduling_algorithm, time_slice = make_processes(workload), workload.runfor, workload.algorithm, workload.quantum
 
-    if scheduling_algorithm == 'fcfs':
-        output = fifo_scheduling(processes, runtime)
-        html_file = write_output_file(input_file, output)
-        webbrowser.open(f"file://{html_file}")  # Open the HTML file in a web browser
-    elif scheduling_algorithm == 'sjf':
-        output = preemptive_sjf(processes, runtime)
-        html_file = write_output_file(input_file, output)
+    state = RunState(processes)
+    # The `use` line picks the algorithm from the engine's registry
+    events = get_algorithm(scheduling_algorithm).events(processes, runtime, state, time_slice, **settings)
+    html_file = write_report(input_file, processes, runtime, scheduling_algorithm, time_slice, state, events, formats)
+
+    write_metrics_files(input_file, processes, runtime, scheduling_algorithm, time_slice, state, formats)
+    if html_file is not None and open_browser:
         webbrowser.open(f"file://{html_file}")  # Open the HTML file in a web browser
-    elif scheduling_algorithm == 'rr':
-        output_file = input_file.split('.')[0] + '.out'
-        with open(output_file, 'w') as file:
-            file.write(format('processes', len(processes)) + '\n')
-            file.write("Using Round-Robin\n")
-            if time_slice is not None:
-                file.write(f"Quantum   {time_slice}\n\n")
-            scheduled, total_time, process_map = round_robin_scheduling(processes, time_slice, runtime)
-            html_file = write_scheduling_to_file(file, scheduled, total_time, processes, runtime, process_map)
-            webbrowser.open(f"file://{html_file}")  # Open the HTML file in a web browser
-    else:
-        print("Unsupported scheduling algorithm:", scheduling_algorithm)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+# Batch mode: simulate many input files in parallel.
+#
+#   python batch.py <directory-or-glob> [--workers N] [--index FILE] [--no-cache]
+#
+# Every input is run through report.run_file() in a process pool and gets its
+# .out next to it, exactly as a single scheduler-gpt.py run would. Workloads seen
+# before are served from the result cache (see result_cache.py) unless
+# --no-cache is given. A JSON index lists every input in sorted order with its
+# aggregate metrics or its error, so the index is the same whatever order the
+# workers finish in.
+
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from report import run_file
+from result_cache import ResultCache
+
+
+def find_inputs(pattern):
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.in')
+    # normpath keeps "./x.in" from turning into an output file named ".out"
+    return sorted(os.path.normpath(path) for path in glob.glob(pattern))
+
+
+def simulate(input_file, cache=None):
+    entry = {'input': input_file, 'output': input_file.split('.')[0] + '.out'}
+    try:
+        summary = run_file(input_file, cache)
+    except Exception as error:
+        # Recorded as an error entry in the index; the remaining files are still simulated
+        return {**entry, 'status': 'error', 'error': f"{type(error).__name__}: {error}"}
+    return {**entry, 'status': 'ok', 'summary': summary}
+
+
+def run_batch(input_files, workers, cache=None):
+    if workers == 1:
+        return [simulate(input_file, cache) for input_file in input_files]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(input_files) // (4 * (workers or os.cpu_count() or 1)))
+        # map() yields results in input order no matter which worker finishes first
+        return list(executor.map(partial(simulate, cache=cache), input_files, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate every input file in a directory or glob in parallel.")
+    parser.add_argument('inputs', help="directory of .in files or a glob pattern")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--index', default=None, help="summary index path (default: batch_index.json in the input directory)")
+    parser.add_argument('--no-cache', action='store_true', help="always simulate, without reading or writing the result cache")
+    args = parser.parse_args()
+
+    input_files = find_inputs(args.inputs)
+    if not input_files:
+        print("No input files found:", args.inputs)
+        return
+
+    index_file = args.index or os.path.join(args.inputs if os.path.isdir(args.inputs) else '.', 'batch_index.json')
+    results = run_batch(input_files, args.workers, None if args.no_cache else ResultCache())
+    with open(index_file, 'w') as file:
+        json.dump({'files': results}, file, indent=2)
+        file.write('\n')
+
+    errors = sum(1 for entry in results if entry['status'] != 'ok')
+    print(f"Simulated {len(results)} files ({errors} failed), index written to {index_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Load-test client for server.py.
+#
+# Sends the same workload many times over concurrent connections and reports
+# throughput and latency percentiles. The workload is either an existing file
+# (.in text or JSON, sent as is) or a synthetic one from workloads.py.
+#
+#   python bench/load_test.py [--host 127.0.0.1] [--port 8642 | --unix PATH]
+#                             [--requests 200] [--concurrency 16]
+#                             [--input FILE | --kind poisson --size 1000 --algorithm rr --quantum 4 [--json]]
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from workloads import KINDS, generate, write_workload
+
+DEFAULT_PORT = 8642
+
+
+def build_request(args):
+    if args.input:
+        with open(args.input, 'rb') as file:
+            return file.read()
+
+    processes = generate(args.kind, args.size, args.seed)
+    if args.json:
+        runfor = max(arrival for _, arrival, _ in processes) + sum(burst for _, _, burst in processes) + 1
+        document = {
+            'processes': [{'name': name, 'arrival': arrival, 'burst': burst} for name, arrival, burst in processes],
+            'runfor': runfor,
+            'use': args.algorithm,
+            'quantum': args.quantum,
+        }
+        return json.dumps(document).encode()
+    with tempfile.TemporaryDirectory(prefix='schedload') as workdir:
+        path = os.path.join(workdir, 'workload.in')
+        write_workload(path, processes, args.algorithm, args.quantum)
+        with open(path, 'rb') as file:
+            return file.read()
+
+
+async def send(args, request):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    writer.write(request)
+    await writer.drain()
+    writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+async def run_load(args, request):
+    latencies = []
+    errors = 0
+    response_bytes = 0
+    pending = iter(range(args.requests))
+
+    async def client():
+        nonlocal errors, response_bytes
+        for _ in pending:
+            start = time.perf_counter()
+            try:
+                response = await send(args, request)
+            except OSError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            response_bytes += len(response)
+            if not response or response.startswith(b'error:'):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    return time.perf_counter() - start, latencies, errors, response_bytes
+
+
+def percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive server.py with concurrent simulation requests.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help="connect to this Unix socket path instead of TCP")
+    parser.add_argument('--requests', type=int, default=200, help="total requests to send")
+    parser.add_argument('--concurrency', type=int, default=16, help="connections open at once")
+    parser.add_argument('--input', default=None, help="workload file to send (default: a synthetic workload)")
+    parser.add_argument('--kind', default='poisson', choices=KINDS)
+    parser.add_argument('--size', type=int, default=1000, help="processes in the synthetic workload")
+    parser.add_argument('--algorithm', default='rr', choices=('fcfs', 'sjf', 'rr'))
+    parser.add_argument('--quantum', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="send the synthetic workload as JSON")
+    args = parser.parse_args()
+
+    request = build_request(args)
+    elapsed, latencies, errors, response_bytes = asyncio.run(run_load(args, request))
+
+    latencies.sort()
+    print(f"{args.requests} requests, concurrency {args.concurrency}: {elapsed:.2f}s, "
+          f"{args.requests / elapsed:.1f} req/s, {errors} errors, {response_bytes / (1 << 20):.1f} MiB received")
+    if latencies:
+        print(f"latency p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms, "
+              f"p99 {percentile(latencies, 99) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
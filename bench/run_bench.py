@@ -0,0 +1,125 @@
+# Benchmark harness for the fcfs, sjf and rr schedulers.
+#
+# Generates synthetic workloads (see workloads.py), simulates each one the way
+# scheduler-gpt.py does in a fresh interpreter and records wall time, peak RSS
+# and events/sec. The results go to <output>/<commit>.json and
+# <output>/<commit>.csv so runs from different commits can be compared side by side.
+#
+#   python bench/run_bench.py [--sizes 1000,10000,100000] [--kinds poisson,heavy_tail,storm]
+#                             [--algorithms fcfs,sjf,rr] [--quanta 1,4,16] [--output bench/results]
+
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from workloads import KINDS, generate, write_workload
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIELDS = ['commit', 'kind', 'processes', 'algorithm', 'quantum', 'runfor', 'wall_s', 'peak_rss_kb', 'events', 'events_per_s']
+
+
+def run_single(input_file):
+    # Child mode: one end-to-end run (parse, simulate, write .out), reported as JSON
+    sys.path.insert(0, REPO_ROOT)
+    from report import run_file
+    start = time.perf_counter()
+    # Without a result cache: every case has to be simulated to be measured
+    run_file(input_file)
+    wall = time.perf_counter() - start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'wall_s': wall, 'peak_rss_kb': peak_rss_kb}))
+
+
+def count_events(output_file):
+    with open(output_file) as file:
+        return sum(1 for line in file if line.startswith('Time'))
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_case(workdir, kind, size, algorithm, quantum, seed):
+    name = f"{kind}_{size}_{algorithm}" + (f"_q{quantum}" if quantum is not None else '')
+    input_file = os.path.join(workdir, name + '.in')
+    runfor = write_workload(input_file, generate(kind, size, seed), algorithm, quantum)
+
+    child = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', input_file], capture_output=True, text=True)
+    if child.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{child.stderr}")
+    result = json.loads(child.stdout.strip().splitlines()[-1])
+
+    events = count_events(input_file.split('.')[0] + '.out')
+    return {
+        'kind': kind,
+        'processes': size,
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'runfor': runfor,
+        'wall_s': round(result['wall_s'], 4),
+        'peak_rss_kb': result['peak_rss_kb'],
+        'events': events,
+        'events_per_s': round(events / result['wall_s']) if result['wall_s'] else None,
+    }
+
+
+def write_report(output_dir, commit, rows):
+    os.makedirs(output_dir, exist_ok=True)
+    json_file = os.path.join(output_dir, commit + '.json')
+    csv_file = os.path.join(output_dir, commit + '.csv')
+    with open(json_file, 'w') as file:
+        json.dump({'commit': commit, 'python': sys.version.split()[0], 'results': rows}, file, indent=2)
+    with open(csv_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows({'commit': commit, **row} for row in rows)
+    return json_file, csv_file
+
+
+def parse_list(value, convert=str):
+    return [convert(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fcfs/sjf/rr schedulers on synthetic workloads.")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="comma-separated process counts")
+    parser.add_argument('--kinds', default=','.join(KINDS), help="comma-separated workload kinds")
+    parser.add_argument('--algorithms', default='fcfs,sjf,rr', help="comma-separated algorithms")
+    parser.add_argument('--quanta', default='1,4,16', help="comma-separated quanta for rr")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'bench', 'results'), help="report directory")
+    parser.add_argument('--run', metavar='INPUT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_single(args.run)
+        return
+
+    commit = current_commit()
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='schedbench') as workdir:
+        for size in parse_list(args.sizes, int):
+            for kind in parse_list(args.kinds):
+                for algorithm in parse_list(args.algorithms):
+                    quanta = parse_list(args.quanta, int) if algorithm == 'rr' else [None]
+                    for quantum in quanta:
+                        row = run_case(workdir, kind, size, algorithm, quantum, args.seed)
+                        rows.append(row)
+                        print(f"{kind:>10} {size:>8} {algorithm:>4} q={str(quantum):>4} "
+                              f"{row['wall_s']:>9.3f}s {row['peak_rss_kb']:>9} KB {row['events_per_s'] or 0:>10} events/s")
+
+    json_file, csv_file = write_report(args.output, commit, rows)
+    print(f"Wrote {json_file} and {csv_file}")
+
+if __name__ == "__main__":
+    main()
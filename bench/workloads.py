@@ -0,0 +1,81 @@
+# Synthetic workload generator for the scheduler benchmarks.
+#
+# Writes .in files in the same format scheduler-gpt.py reads:
+#   python bench/workloads.py <kind> <processes> <algorithm> <output.in> [quantum] [seed]
+#
+# Kinds:
+#   poisson     Poisson arrivals (exponential gaps), exponential bursts
+#   heavy_tail  Poisson arrivals, Pareto-distributed bursts (a few very long jobs)
+#   storm       quiet gaps followed by storms of many jobs arriving on the same tick
+
+import random
+import sys
+
+KINDS = ('poisson', 'heavy_tail', 'storm')
+
+MEAN_ARRIVAL_GAP = 4
+MEAN_BURST = 5
+MAX_BURST = 1000
+
+
+def poisson_arrivals(rng, count):
+    arrivals = []
+    time = 0.0
+    for _ in range(count):
+        time += rng.expovariate(1 / MEAN_ARRIVAL_GAP)
+        arrivals.append(int(time))
+    return arrivals
+
+
+def storm_arrivals(rng, count):
+    arrivals = []
+    time = 0
+    while len(arrivals) < count:
+        time += rng.randint(MEAN_ARRIVAL_GAP, 20 * MEAN_ARRIVAL_GAP)
+        storm_size = min(rng.randint(10, 200), count - len(arrivals))
+        arrivals.extend([time] * storm_size)
+    return arrivals
+
+
+def generate(kind, count, seed=0):
+    rng = random.Random(seed)
+    if kind == 'poisson':
+        arrivals = poisson_arrivals(rng, count)
+        bursts = [max(1, round(rng.expovariate(1 / MEAN_BURST))) for _ in range(count)]
+    elif kind == 'heavy_tail':
+        arrivals = poisson_arrivals(rng, count)
+        bursts = [min(MAX_BURST, int(rng.paretovariate(1.5))) for _ in range(count)]
+    elif kind == 'storm':
+        arrivals = storm_arrivals(rng, count)
+        bursts = [rng.randint(1, 2 * MEAN_BURST) for _ in range(count)]
+    else:
+        raise ValueError(f"unknown workload kind: {kind}")
+    return [(f"P{index}", arrival, burst) for index, (arrival, burst) in enumerate(zip(arrivals, bursts), 1)]
+
+
+def write_workload(path, processes, algorithm, quantum=None):
+    # Run long enough for every process to finish: the RR report needs finish times
+    runfor = max(arrival for _, arrival, _ in processes) + sum(burst for _, _, burst in processes) + 1
+    with open(path, 'w') as file:
+        file.write(f"processcount {len(processes)}\n")
+        file.write(f"runfor {runfor}\n")
+        file.write(f"use {algorithm}\n")
+        if quantum is not None:
+            file.write(f"quantum {quantum}\n")
+        file.writelines(f"process name {name} arrival {arrival} burst {burst}\n" for name, arrival, burst in processes)
+        file.write("end\n")
+    return runfor
+
+
+def main():
+    if len(sys.argv) not in (5, 6, 7):
+        print("Usage: python bench/workloads.py <kind> <processes> <algorithm> <output.in> [quantum] [seed]")
+        return
+
+    kind, count, algorithm, path = sys.argv[1], int(sys.argv[2]), sys.argv[3], sys.argv[4]
+    quantum = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    seed = int(sys.argv[6]) if len(sys.argv) > 6 else 0
+    write_workload(path, generate(kind, count, seed), algorithm, quantum)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Binary event trace, written next to the .out by `scheduler-gpt.py <file> --trace`.
+#
+# The trace holds the same run as the .out text, as fixed-width records that can
+# be memory-mapped instead of parsed. Layout (little-endian, sections 8-byte aligned):
+#   header     HEADER: magic, version, algorithm, quantum, runfor, then the
+#              process count, event count and the offsets of the sections below
+#   events     EVENT per event: time, value, process id, kind (24 bytes)
+#   processes  PROCESS per process: arrival, burst, start, finish, remaining burst
+#   names      the process names, NUL separated, in process id order
+# Events follow the schedulers' records (see engine.py):
+# value is the burst left for 'selected' and the end of the span for 'idle'.
+# Times that were never set are stored as MISSING.
+#
+#   python binary_trace.py <file.trace> [output.out]
+#
+# renders a trace back to the exact .out text, on stdout or into a file.
+
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+
+from engine import Process, RunState
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b'SCHEDTRC'
+VERSION = 1
+MISSING = -(1 << 63)
+EVENT_KINDS = ('arrived', 'selected', 'finished', 'idle')
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+
+HEADER = struct.Struct('<8sI4x8sqqqqqqq')
+EVENT = struct.Struct('<qqiB3x')
+PROCESS = struct.Struct('<qqqqq')
+WRITE_BUFFER_SIZE = 1 << 20
+READ_CHUNK = 1 << 16
+
+if np is not None:
+    EVENT_DTYPE = np.dtype([('time', '<i8'), ('value', '<i8'), ('pid', '<i4'), ('kind', 'u1'), ('pad', 'V3')])
+    PROCESS_DTYPE = np.dtype([('arrival', '<i8'), ('burst', '<i8'), ('start', '<i8'), ('finish', '<i8'), ('remaining', '<i8')])
+
+# events and processes are NumPy record arrays mapped onto the file when NumPy is
+# installed, and lists of tuples in EVENT/PROCESS field order otherwise
+Trace = namedtuple('Trace', ['algorithm', 'quantum', 'runfor', 'names', 'processes', 'events'])
+
+
+def _optional(value):
+    return MISSING if value is None else value
+
+
+def _align(size):
+    return -size % 8
+
+
+class TraceWriter:
+    def __init__(self, path, algorithm, quantum, runtime):
+        self.path = path
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.runtime = runtime
+        self.event_count = 0
+        self.finished = False
+        self._buffer = bytearray()
+        self._file = open(path, 'wb')
+        # The header is written last, once the counts and offsets are known
+        self._file.write(bytes(HEADER.size))
+
+    def record(self, events):
+        # Pass the events through unchanged, packing each one on the way
+        pack = EVENT.pack
+        buffer = self._buffer
+        for event in events:
+            buffer += pack(event[0], event[3], event[2], KIND_CODES[event[1]])
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                self._file.write(buffer)
+                self.event_count += len(buffer) // EVENT.size
+                buffer.clear()
+            yield event
+        self._file.write(buffer)
+        self.event_count += len(buffer) // EVENT.size
+        buffer.clear()
+
+    def finish(self, processes, state):
+        table_offset = HEADER.size + self.event_count * EVENT.size
+        self._file.write(b''.join(
+            PROCESS.pack(p.arrival, p.burst, _optional(start), _optional(finish), remaining)
+            for p, start, finish, remaining in zip(processes, state.start_time, state.finish_time, state.remaining_burst)
+        ))
+        names = '\0'.join(p.name for p in processes).encode()
+        names_offset = table_offset + len(processes) * PROCESS.size
+        self._file.write(names + bytes(_align(len(names))))
+
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.algorithm.encode(), _optional(self.quantum), _optional(self.runtime),
+                                     len(processes), self.event_count, table_offset, names_offset, len(names)))
+        self._file.close()
+        self.finished = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # A run that did not get to finish() leaves no trace behind
+        if not self.finished:
+            self._file.close()
+            os.remove(self.path)
+
+
+def read_trace(path):
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a scheduler trace")
+        magic, version, algorithm, quantum, runfor, process_count, event_count, table_offset, names_offset, names_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a scheduler trace")
+        if version != VERSION:
+            raise ValueError(f"{path} is trace version {version}, expected {VERSION}")
+        file.seek(names_offset)
+        names_data = file.read(names_size)
+
+    names = names_data.decode().split('\0') if process_count else []
+    if np is not None:
+        def mapped(dtype, offset, count):
+            # np.memmap cannot map an empty range
+            if not count:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+        events = mapped(EVENT_DTYPE, HEADER.size, event_count)
+        processes = mapped(PROCESS_DTYPE, table_offset, process_count)
+    else:
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            events = list(EVENT.iter_unpack(data[HEADER.size:table_offset]))
+            processes = list(PROCESS.iter_unpack(data[table_offset:table_offset + process_count * PROCESS.size]))
+
+    return Trace(
+        algorithm=algorithm.rstrip(b'\0').decode(),
+        quantum=None if quantum == MISSING else quantum,
+        runfor=None if runfor == MISSING else runfor,
+        names=names,
+        processes=processes,
+        events=events,
+    )
+
+
+def _rows(records):
+    # Records as plain tuples, converted from the mapped array a chunk at a time
+    if np is None:
+        return iter(records)
+    return (row for start in range(0, len(records), READ_CHUNK) for row in records[start:start + READ_CHUNK].tolist())
+
+
+def trace_report(trace):
+    # The .out lines of a traced run, rendered by the scheduler's own report code.
+    # Imported here because report.py imports this module.
+    from report import schedule_report
+
+    rows = list(_rows(trace.processes))
+    processes = [Process(name, arrival, burst) for name, (arrival, burst, _, _, _) in zip(trace.names, rows)]
+    state = RunState(processes)
+    for pid, (_, _, start, finish, remaining) in enumerate(rows):
+        state.start_time[pid] = None if start == MISSING else start
+        state.finish_time[pid] = None if finish == MISSING else finish
+        state.remaining_burst[pid] = remaining
+
+    events = ((time, EVENT_KINDS[kind], pid, value) for time, value, pid, kind, *_ in _rows(trace.events))
+    return schedule_report(processes, trace.runfor, trace.algorithm, trace.quantum, state, events)
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python binary_trace.py <file.trace> [output.out]")
+        return
+
+    try:
+        trace = read_trace(sys.argv[1])
+    except ValueError as error:
+        print(error)
+        return
+
+    lines = (f"{line}\n" for line in trace_report(trace))
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], 'w') as file:
+            file.writelines(lines)
+    else:
+        sys.stdout.writelines(lines)
+
+if __name__ == "__main__":
+    main()
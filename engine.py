@@ -0,0 +1,406 @@
+# The scheduling engine shared by every entry point.
+#
+# The workload model, the run state and the scheduling algorithms are implemented
+# here once. scheduler-gpt.py, Bonus.py, fifo_scheduler.py, sjf_scheduler.py,
+# rr.py, sweep.py and server.py all simulate through this module and only differ
+# in the text they write. Algorithms are registered under the name used on the
+# `use` line of an input file:
+#
+#   algorithm = get_algorithm('rr')        # ValueError for an unknown name
+#   state = RunState(processes)
+#   for time, kind, pid, value in algorithm.events(processes, runfor, state, quantum):
+#       ...
+#
+# Event records are (time, kind, pid, value). kind is 'arrived', 'selected',
+# 'finished' or 'idle'. pid is the index of the process in `processes`, or -1 for
+# idle. value is the burst left for 'selected', the end of the span (exclusive)
+# for 'idle', and 0 otherwise. Records come in time order.
+#
+# A new algorithm is an event function with the same signature, added with
+# @register(name, title). title is the name shown in the .out header. An algorithm
+# with settings of its own also passes configure, a function that turns a parsed
+# workload into keyword arguments for the event function; algorithm_options()
+# calls it, and raises ValueError for settings it cannot use.
+
+import heapq
+from collections import deque, namedtuple
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Algorithm = namedtuple('Algorithm', ['name', 'title', 'events', 'configure'])
+
+# Registered algorithms by name, in registration order
+ALGORITHMS = {}
+
+
+def register(name, title, configure=None):
+    def add(events):
+        ALGORITHMS[name] = Algorithm(name, title, events, configure)
+        return events
+    return add
+
+
+def get_algorithm(name):
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported scheduling algorithm: {name}") from None
+
+
+def algorithm_options(workload):
+    # Keyword arguments for the event function of the workload's algorithm
+    algorithm = get_algorithm(workload.algorithm)
+    return algorithm.configure(workload) if algorithm.configure is not None else {}
+
+
+# A process only describes the workload; the schedulers never modify it
+class Process:
+    # __slots__ drops the per-instance __dict__, which matters with millions of processes
+    __slots__ = ('name', 'arrival', 'burst')
+
+    def __init__(self, name: str, arrival: int, burst: int):
+        self.name = name
+        self.arrival = arrival
+        self.burst = burst
+
+    def __repr__(self):
+        return f"Process(name='{self.name}', arrival={self.arrival}, burst={self.burst})"
+
+
+# Everything a run changes, one column per field, indexed by the position of each
+# process in the list handed to the scheduler. Keeping it out of the processes
+# lets one parsed workload feed any number of runs, concurrent ones included.
+# Times that were never reached are None.
+class RunState:
+    __slots__ = ('remaining_burst', 'start_time', 'finish_time')
+
+    def __init__(self, processes):
+        self.remaining_burst = [p.burst for p in processes]
+        self.start_time = [None] * len(processes)
+        self.finish_time = [None] * len(processes)
+
+
+def make_processes(workload):
+    return [Process(name, arrival, burst) for name, arrival, burst in zip(workload.names, workload.arrival, workload.burst)]
+
+
+def run_algorithm(processes, runtime, algorithm, quantum=None, state=None, options=None):
+    # Run an algorithm for its run state only, dropping the events
+    if state is None:
+        state = RunState(processes)
+    deque(get_algorithm(algorithm).events(processes, runtime, state, quantum, **(options or {})), maxlen=0)
+    return state
+
+
+# Discrete-event helper shared by the schedulers: instead of stepping one tick at
+# a time, jump straight to the earliest pending arrival, completion or quantum
+# expiry, never past the end of the run.
+def next_event_time(runtime, *candidates):
+    return min([runtime] + [time for time in candidates if time is not None])
+
+
+# FIFO has a closed form: finish[i] = max(arrival[i], finish[i - 1]) + burst[i]
+# unrolls to cumsum(burst)[i] + max(0, running max of arrival[j] - burst done before j),
+# so all start/finish times come from a cumulative sum and a running maximum
+def fifo_schedule(arrivals, bursts):
+    if np is not None:
+        arrivals = np.asarray(arrivals, dtype=np.int64)
+        bursts = np.asarray(bursts, dtype=np.int64)
+        burst_done = np.cumsum(bursts)
+        finish_times = burst_done + np.maximum(np.maximum.accumulate(arrivals - (burst_done - bursts)), 0)
+        return (finish_times - bursts).tolist(), finish_times.tolist()
+
+    start_times, finish_times = [], []
+    current_time = 0
+    for arrival, burst in zip(arrivals, bursts):
+        current_time = max(current_time, arrival)
+        start_times.append(current_time)
+        current_time += burst
+        finish_times.append(current_time)
+    return start_times, finish_times
+
+
+# First-Come, First-Served (FIFO)
+@register('fcfs', "First-Come First-Served")
+def fifo_events(processes, runtime, state, quantum=None):
+    order = sorted(range(len(processes)), key=lambda pid: processes[pid].arrival)
+    arrivals = [processes[pid].arrival for pid in order]
+    bursts = [processes[pid].burst for pid in order]
+    start_times, finish_times = fifo_schedule(arrivals, bursts)
+    for pid, burst, start_time, finish_time in zip(order, bursts, start_times, finish_times):
+        state.start_time[pid] = start_time
+        state.finish_time[pid] = finish_time
+        state.remaining_burst[pid] = burst - max(0, min(finish_time, runtime) - start_time)
+
+    # Arrivals, starts and finishes are each already in time order, so merge them
+    # lazily by time and priority instead of building and sorting an event log
+    arrived = ((arrival, 'arrived', pid, 0) for pid, arrival in zip(order, arrivals))
+    finished = ((finish_time, 'finished', pid, 0) for pid, finish_time in zip(order, finish_times))
+    selected = ((start_time, 'selected', pid, burst) for pid, start_time, burst in zip(order, start_times, bursts))
+    timeline = heapq.merge(arrived, finished, selected, key=lambda x: (x[0], {'arrived': 0, 'finished': 1, 'selected': 2}[x[1]]))
+
+    selected_processes = set()
+    time = 0
+    for event_time, events_at_time in groupby(timeline, key=lambda x: x[0]):
+        if event_time < 0:
+            continue
+        if event_time >= runtime:
+            break
+        if not selected_processes and time < event_time:
+            yield (time, 'idle', -1, event_time)
+        events_at_time = list(events_at_time)
+        for event in events_at_time:
+            yield event
+            if event[1] == 'finished':
+                selected_processes.discard(event[2])
+                if len(events_at_time) == 1 and not selected_processes:
+                    yield (event_time, 'idle', -1, event_time + 1)
+            elif event[1] == 'selected':
+                selected_processes.add(event[2])
+        time = event_time + 1
+    if not selected_processes and time < runtime:
+        yield (time, 'idle', -1, runtime)
+
+
+# Records at the same time go out as arrivals, finishes, selections, then idle
+SJF_ORDER = {'arrived': 0, 'finished': 1, 'selected': 2, 'idle': 3}
+
+
+# Pre-emptive Shortest Job First (SJF)
+@register('sjf', "preemptive Shortest Job First")
+def sjf_events(processes, runtime, state, quantum=None):
+    remaining_burst, start_time, finish_time = state.remaining_burst, state.start_time, state.finish_time
+
+    # Queues hold process ids, the index of each process in `processes`
+    arrivals = deque(sorted(range(len(processes)), key=lambda pid: processes[pid].arrival))
+    current_time = 0
+    ready_queue = []
+    sequence = 0
+    current = None
+    # Records not passed on yet. Each step only adds records at or after its own
+    # time, so anything older is final and goes out, in order, at the next step;
+    # only the few records that can still tie with later ones are held back.
+    event_log = []
+
+    while current_time < runtime:
+        if event_log:
+            event_log.sort(key=lambda x: (x[0], SJF_ORDER[x[1]]))
+            done = sum(1 for event in event_log if event[0] < current_time)
+            yield from event_log[:done]
+            del event_log[:done]
+
+        while arrivals and processes[arrivals[0]].arrival <= current_time:
+            pid = arrivals.popleft()
+            heapq.heappush(ready_queue, (remaining_burst[pid], sequence, pid))
+            sequence += 1
+            event_log.append((current_time, 'arrived', pid, 0))
+
+        if ready_queue:
+            if current is None or ready_queue[0][0] < remaining_burst[current]:
+                if current is not None:
+                    heapq.heappush(ready_queue, (remaining_burst[current], sequence, current))
+                    sequence += 1
+                current = heapq.heappop(ready_queue)[2]
+                if start_time[current] is None:
+                    start_time[current] = current_time
+                event_log.append((current_time, 'selected', current, remaining_burst[current]))
+
+        next_arrival = processes[arrivals[0]].arrival if arrivals else None
+        if current is not None:
+            completion = current_time + remaining_burst[current] if remaining_burst[current] > 0 else None
+            next_time = next_event_time(runtime, next_arrival, completion)
+            remaining_burst[current] -= next_time - current_time
+            if remaining_burst[current] == 0:
+                finish_time[current] = next_time
+                event_log.append((next_time, 'finished', current, 0))
+                current = None
+                if not ready_queue and (next_arrival is None or next_arrival > next_time):
+                    event_log.append((next_time, 'idle', -1, next_time + 1))
+        else:
+            next_time = next_event_time(runtime, next_arrival)
+            if current_time + 1 < next_time:
+                event_log.append((current_time + 1, 'idle', -1, next_time))
+
+        current_time = next_time
+
+    event_log.sort(key=lambda x: (x[0], SJF_ORDER[x[1]]))
+    for event in event_log:
+        if event[0] >= runtime:
+            break
+        if event[1] == 'idle' and event[3] > runtime:
+            event = (event[0], 'idle', -1, runtime)
+        yield event
+
+
+def rr_options(workload):
+    # A quantum below 1 would never move the time forward
+    if workload.quantum is None:
+        raise ValueError("Round-Robin needs a quantum")
+    if workload.quantum < 1:
+        raise ValueError(f"quantum must be at least 1, not {workload.quantum}")
+    return {}
+
+
+# Round Robin (RR). Unlike fcfs and sjf, records at the end of the run itself are kept.
+@register('rr', "Round-Robin", configure=rr_options)
+def round_robin_events(processes, runtime, state, quantum=None):
+    remaining_burst, start_time, finish_time = state.remaining_burst, state.start_time, state.finish_time
+    queue = deque()
+    time = 0
+    # Events and queues refer to processes by their index in `processes`
+    arrivals = deque(sorted(range(len(processes)), key=lambda pid: processes[pid].arrival))
+
+    while time < runtime:
+        while arrivals and processes[arrivals[0]].arrival <= time:
+            arriving_pid = arrivals.popleft()
+            yield (time, "arrived", arriving_pid, 0)
+            queue.append(arriving_pid)
+
+        if queue:
+            pid = queue.popleft()
+            if start_time[pid] is None:
+                start_time[pid] = time
+
+            run_time = min(remaining_burst[pid], quantum)
+            yield (time, "selected", pid, remaining_burst[pid])
+
+            slice_end = next_event_time(runtime, time + run_time)
+            while arrivals and processes[arrivals[0]].arrival <= slice_end:
+                arriving_pid = arrivals.popleft()
+                yield (processes[arriving_pid].arrival, "arrived", arriving_pid, 0)
+                queue.append(arriving_pid)
+            remaining_burst[pid] -= slice_end - time
+            time = slice_end
+
+            if remaining_burst[pid] == 0:
+                finish_time[pid] = time
+                yield (time, "finished", pid, 0)
+                if time < runtime and not queue and (not arrivals or processes[arrivals[0]].arrival > time):
+                    yield (time, "idle", -1, time + 1)  # Add idle only if no process is ready to run
+            else:
+                queue.append(pid)
+        else:
+            if arrivals:
+                time = processes[arrivals[0]].arrival
+            else:
+                # Ensure Idle is added only within the runtime
+                if time + 1 < runtime:
+                    yield (time + 1, "idle", -1, runtime)
+                time = runtime
+
+MLFQ_LEVELS = 3
+
+
+def mlfq_quanta(quantum, levels=MLFQ_LEVELS):
+    # The default quanta: the quantum (1 if unset) on the top level, doubling at each level down
+    quantum = 1 if quantum is None else quantum
+    return tuple(quantum << level for level in range(levels))
+
+
+def mlfq_options(workload):
+    if workload.quanta is None:
+        quanta = mlfq_quanta(workload.quantum, MLFQ_LEVELS if workload.levels is None else max(workload.levels, 0))
+    elif workload.levels is not None and workload.levels != len(workload.quanta):
+        raise ValueError(f"levels is {workload.levels} but {len(workload.quanta)} quanta are given")
+    else:
+        quanta = workload.quanta
+    if not quanta or min(quanta) < 1:
+        raise ValueError("mlfq needs at least one level, each with a quantum of at least 1")
+    if workload.boost is not None and workload.boost < 1:
+        raise ValueError(f"boost must be at least 1, not {workload.boost}")
+    return {'quanta': quanta, 'boost': workload.boost}
+
+
+# Multilevel Feedback Queue (MLFQ). Processes arrive on the top level. A process
+# that has used up its level's quantum, over however many turns, moves down one
+# level; the bottom level is round robin. A process waiting on a higher level than
+# the running one preempts it, and every `boost` time units all processes go back
+# to the top level. Each level is a deque and the non-empty levels are bits of one
+# int, so picking the next process costs the same however many are waiting.
+@register('mlfq', "Multilevel Feedback Queue", configure=mlfq_options)
+def mlfq_events(processes, runtime, state, quantum=None, quanta=None, boost=None):
+    if quanta is None:
+        quanta = mlfq_quanta(quantum)
+    remaining_burst, start_time, finish_time = state.remaining_burst, state.start_time, state.finish_time
+    bottom = len(quanta) - 1
+    queues = [deque() for _ in quanta]
+    # Bit i is set while queues[i] is not empty, so the lowest set bit is the top waiting level
+    waiting = 0
+    level = [0] * len(processes)
+    used = [0] * len(processes)
+    # A boost resets the quantum used by every process. Rather than touching them
+    # all, each process catches up on the boosts it missed when it is next selected.
+    boosts = 0
+    boosts_seen = [0] * len(processes)
+    next_boost = boost
+
+    arrivals = deque(sorted(range(len(processes)), key=lambda pid: processes[pid].arrival))
+    time = 0
+    current = None
+
+    while time < runtime:
+        while arrivals and processes[arrivals[0]].arrival <= time:
+            pid = arrivals.popleft()
+            queues[0].append(pid)
+            waiting |= 1
+            yield (time, 'arrived', pid, 0)
+
+        if next_boost is not None and time >= next_boost:
+            for lower in range(1, bottom + 1):
+                if waiting >> lower & 1:
+                    queues[0].extend(queues[lower])
+                    queues[lower].clear()
+            waiting = 1 if queues[0] else 0
+            boosts += 1
+            if current is not None:
+                level[current] = used[current] = 0
+                boosts_seen[current] = boosts
+            next_boost = (time // boost + 1) * boost
+
+        # Any waiting process on a higher level preempts; it keeps its place at the head of its level
+        if current is not None and waiting & ((1 << level[current]) - 1):
+            queues[level[current]].appendleft(current)
+            waiting |= 1 << level[current]
+            current = None
+
+        if current is None and waiting:
+            top = (waiting & -waiting).bit_length() - 1
+            current = queues[top].popleft()
+            if not queues[top]:
+                waiting &= ~(1 << top)
+            level[current] = top
+            if boosts_seen[current] != boosts:
+                used[current] = 0
+                boosts_seen[current] = boosts
+            if start_time[current] is None:
+                start_time[current] = time
+            yield (time, 'selected', current, remaining_burst[current])
+
+        next_arrival = processes[arrivals[0]].arrival if arrivals else None
+        if current is None:
+            next_time = next_event_time(runtime, next_arrival)
+            yield (time, 'idle', -1, next_time)
+            time = next_time
+            continue
+
+        quantum_end = time + quanta[level[current]] - used[current]
+        next_time = next_event_time(runtime, next_arrival, time + max(remaining_burst[current], 0), quantum_end, next_boost)
+        remaining_burst[current] -= next_time - time
+        used[current] += next_time - time
+        time = next_time
+        if remaining_burst[current] <= 0:
+            finish_time[current] = time
+            if time < runtime:
+                yield (time, 'finished', current, 0)
+            current = None
+        elif time == quantum_end:
+            lower = min(level[current] + 1, bottom)
+            used[current] = 0
+            queues[lower].append(current)
+            waiting |= 1 << lower
+            current = None
+
@@ -0,0 +1,132 @@
+# Bulk parser for the .in workload format.
+#
+# The whole file is memory-mapped and scanned in bulk, one fixed-size chunk of
+# lines at a time, so no per-line lists are built and the bytes in memory at once
+# do not grow with the file. Processes come back as columns (a list of names and
+# two int64 arrays) instead of one object per line.
+#
+# parse_workload_json() reads the same workload from a JSON document:
+#   {"processes": [{"name": "P01", "arrival": 0, "burst": 5}, ...],
+#    "runfor": 20, "use": "rr", "quantum": 2}
+#
+# mlfq also reads "levels <n>", "quanta <q0>,<q1>,..." (one quantum per level, top
+# level first) and "boost <period>"; in JSON quanta is a list.
+
+import json
+import mmap
+import re
+from array import array
+from collections import namedtuple
+
+Workload = namedtuple('Workload', ['names', 'arrival', 'burst', 'processcount', 'runfor', 'algorithm', 'quantum', 'levels', 'quanta', 'boost'])
+SETTINGS = ('processcount', 'runfor', 'use', 'quantum', 'levels', 'quanta', 'boost')
+
+# Same token positions as the line-by-line parser: parts[2], parts[4] and parts[6]
+PROCESS_LINE = re.compile(rb'^[ \t]*process[ \t]+\S+[ \t]+(\S+)[ \t]+\S+[ \t]+(\S+)[ \t]+\S+[ \t]+(\S+)', re.M)
+SETTING_LINE = re.compile(rb'^[ \t]*(processcount|runfor|use|quantum|levels|quanta|boost)[ \t]+(\S+)', re.M)
+# Anchoring on the newline (rather than ^ with re.M) lets the regex engine skip ahead quickly
+END_LINE = re.compile(rb'\n[ \t]*end(?=\s|$)')
+FIRST_LINE_END = re.compile(rb'[ \t]*end(?=\s|$)')
+PROCESS_FIELDS = 7
+# Bytes of process lines scanned at a time; a chunk is extended to the end of its last line
+CHUNK_SIZE = 1 << 20
+
+
+def read_workload(filename):
+    with open(filename, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return parse_workload(b'')
+        with data:
+            return parse_workload(data)
+
+
+def parse_workload(data):
+    # Everything after the first "end" line is ignored
+    if FIRST_LINE_END.match(data):
+        stop = 0
+    else:
+        end = END_LINE.search(data)
+        stop = end.start() + 1 if end else len(data)
+
+    names, arrival, burst = [], array('q'), array('q')
+    first_process = PROCESS_LINE.search(data, 0, stop)
+    settings_stop = stop
+    if first_process:
+        start = first_process.start()
+        mixed = False
+        while start < stop:
+            end = data.rfind(b'\n', start, min(start + CHUNK_SIZE, stop)) + 1
+            if end <= start:
+                # A single line longer than a chunk
+                end = data.find(b'\n', start, stop) + 1 or stop
+            chunk = data[start:end]
+            if not _process_block(chunk, names, arrival, burst):
+                # Settings or other lines are mixed in with the processes: match process lines one by one
+                mixed = True
+                for row in PROCESS_LINE.findall(chunk):
+                    names.append(row[0].decode())
+                    arrival.append(int(row[1]))
+                    burst.append(int(row[2]))
+            start = end
+        if not mixed:
+            settings_stop = first_process.start()
+
+    # Later settings override earlier ones, as in the line-by-line parser
+    settings = {key.decode(): value.decode() for key, value in SETTING_LINE.findall(data, 0, settings_stop)}
+    if 'quanta' in settings:
+        settings['quanta'] = settings['quanta'].split(',')
+    return _workload(names, arrival, burst, settings)
+
+
+def parse_workload_json(data):
+    try:
+        document = json.loads(data)
+        processes = document['processes']
+        names = [str(process['name']) for process in processes]
+        arrival = array('q', [int(process['arrival']) for process in processes])
+        burst = array('q', [int(process['burst']) for process in processes])
+        settings = {key: document[key] for key in SETTINGS if document.get(key) is not None}
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"not a JSON workload: {error!r}") from error
+    if not isinstance(settings.get('quanta', []), list):
+        raise ValueError("quanta must be a list")
+    return _workload(names, arrival, burst, settings)
+
+
+def _workload(names, arrival, burst, settings):
+    processcount = int(settings['processcount']) if 'processcount' in settings else None
+    if processcount is not None and processcount != len(names):
+        raise ValueError(f"processcount is {processcount} but {len(names)} processes are listed")
+
+    return Workload(
+        names=names,
+        arrival=arrival,
+        burst=burst,
+        processcount=processcount,
+        runfor=int(settings['runfor']) if 'runfor' in settings else None,
+        algorithm=settings.get('use'),
+        quantum=int(settings['quantum']) if 'quantum' in settings else None,
+        levels=int(settings['levels']) if 'levels' in settings else None,
+        quanta=tuple(int(quantum) for quantum in settings['quanta']) if 'quanta' in settings else None,
+        boost=int(settings['boost']) if 'boost' in settings else None,
+    )
+
+
+def _process_block(chunk, names, arrival, burst):
+    # Fast path for the usual layout, where every line of the chunk is a
+    # "process name <name> arrival <n> burst <n>" line. Then the columns are plain
+    # strided slices of one split(), appended to the columns given. Returns False,
+    # and appends nothing, for any other layout.
+    tokens = chunk.split()
+    count, leftover = divmod(len(tokens), PROCESS_FIELDS)
+    lines = chunk.count(b'\n') + (not chunk.endswith(b'\n'))
+    if leftover or count != lines or chunk.count(b'\nprocess') != count - 1 or tokens[0::PROCESS_FIELDS].count(b'process') != count:
+        return False
+
+    names.extend(b' '.join(tokens[2::PROCESS_FIELDS]).decode().split(' '))
+    arrival.extend(map(int, tokens[4::PROCESS_FIELDS]))
+    burst.extend(map(int, tokens[6::PROCESS_FIELDS]))
+    return True
@@ -0,0 +1,84 @@
+# Column-wise scheduling metrics.
+#
+# process_metrics() turns a list of scheduled processes, plus the run state the
+# scheduler filled in for them, into per-process columns (status, wait,
+# turnaround, response, executed time), and summarize() reduces those columns to
+# aggregate statistics. NumPy is used when it is installed; otherwise the same
+# columns are built as plain lists.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NEVER_SELECTED = 0
+DID_NOT_FINISH = 1
+FINISHED = 2
+
+PERCENTILES = (50, 95, 99)
+
+
+def process_metrics(processes, runtime, state):
+    arrival = [p.arrival for p in processes]
+    burst = [p.burst for p in processes]
+    remaining, start_times, finish_times = state.remaining_burst, state.start_time, state.finish_time
+    # None sentinels become -1 so the columns stay integer typed
+    start = [-1 if start_time is None else start_time for start_time in start_times]
+    finish = [-1 if finish_time is None else finish_time for finish_time in finish_times]
+
+    if np is not None:
+        arrival, burst, remaining, start, finish = (np.array(column, dtype=np.int64) for column in (arrival, burst, remaining, start, finish))
+        status = np.where(start < 0, NEVER_SELECTED, np.where((finish < 0) | (finish > runtime), DID_NOT_FINISH, FINISHED))
+        return {
+            'status': status,
+            'wait': finish - arrival - burst,
+            'turnaround': finish - arrival,
+            'response': start - arrival,
+            'executed': burst - remaining,
+        }
+
+    status = [NEVER_SELECTED if s < 0 else DID_NOT_FINISH if f < 0 or f > runtime else FINISHED for s, f in zip(start, finish)]
+    return {
+        'status': status,
+        'wait': [f - a - b for f, a, b in zip(finish, arrival, burst)],
+        'turnaround': [f - a for f, a in zip(finish, arrival)],
+        'response': [s - a for s, a in zip(start, arrival)],
+        'executed': [b - r for b, r in zip(burst, remaining)],
+    }
+
+
+def _percentile(sorted_values, percent):
+    # Linear interpolation between closest ranks, the same rule as numpy.percentile
+    rank = (len(sorted_values) - 1) * percent / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(processes, runtime, columns=None, state=None):
+    if columns is None:
+        columns = process_metrics(processes, runtime, state)
+    summary = {'processes': len(processes)}
+
+    if np is not None:
+        finished = columns['status'] == FINISHED
+        summary['finished'] = int(finished.sum())
+        busy = int(columns['executed'].clip(min=0).sum())
+        for name in ('wait', 'turnaround', 'response'):
+            values = columns[name][finished]
+            summary[name] = {'mean': float(values.mean()) if values.size else None}
+            for percent in PERCENTILES:
+                summary[name][f'p{percent}'] = float(np.percentile(values, percent)) if values.size else None
+    else:
+        finished = [status == FINISHED for status in columns['status']]
+        summary['finished'] = sum(finished)
+        busy = sum(max(executed, 0) for executed in columns['executed'])
+        for name in ('wait', 'turnaround', 'response'):
+            values = sorted(value for value, done in zip(columns[name], finished) if done)
+            summary[name] = {'mean': sum(values) / len(values) if values else None}
+            for percent in PERCENTILES:
+                summary[name][f'p{percent}'] = float(_percentile(values, percent)) if values else None
+
+    summary['throughput'] = summary['finished'] / runtime if runtime else None
+    summary['cpu_utilization'] = busy / runtime if runtime else None
+    return summary
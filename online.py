@@ -0,0 +1,337 @@
+# Online scheduling: feed processes in as they arrive instead of all up front.
+#
+#   scheduler = create_scheduler('rr', quantum=2)
+#   scheduler.submit(process)      # anything with name, arrival and burst
+#   scheduler.advance(10)          # simulate up to, not including, time 10
+#   for event in scheduler.events():
+#       ...
+#
+# Events are tuples with the job's name, rather than the engine's process index:
+#   (time, 'arrived', name)
+#   (time, 'selected', name, remaining burst)
+#   (time, 'idle')                 the CPU ran out of work
+#   (time, 'finished', name, wait, turnaround, response)
+# A job is dropped as soon as its finished event is queued, so memory only grows
+# with the number of jobs in the system and the events not read yet.
+#
+# Everything before the time given to advance() is settled, so a submitted
+# process may not arrive before it. advance() without a time runs until every
+# submitted job has finished.
+#
+# Each online policy is registered with @policy under the name of the engine
+# algorithm it follows, so create_scheduler() accepts the same `use` names as an
+# input file. An algorithm without an online policy is rejected. The policies
+# are incremental rewrites of the engine's event functions; tests/test_online.py
+# holds each one to the start and finish times of the engine's.
+#
+#   python online.py <fcfs|sjf|rr|mlfq> [quantum] < jobs.txt
+#
+# reads "name arrival burst" lines in arrival order from stdin and prints each
+# event as soon as it is final.
+
+import heapq
+import sys
+from collections import deque
+
+from engine import ALGORITHMS, Process, get_algorithm, mlfq_quanta
+
+# Online policy classes by algorithm name
+POLICIES = {}
+
+
+def policy(name):
+    def add(cls):
+        # Only an algorithm the engine knows can have an online policy
+        get_algorithm(name)
+        POLICIES[name] = cls
+        return cls
+    return add
+
+
+# The run state of one submitted process
+class Job:
+    __slots__ = ('process', 'remaining', 'start_time', 'level', 'used')
+
+    def __init__(self, process):
+        self.process = process
+        self.remaining = process.burst
+        self.start_time = None
+        # Only used by MLFQ: the job's level and the quantum it has used there
+        self.level = 0
+        self.used = 0
+
+
+class Scheduler:
+    # Whether a job whose slice ran out is queued again ahead of the jobs arriving
+    # at that same time, rather than behind them
+    REQUEUE_FIRST = False
+
+    def __init__(self):
+        self.time = 0
+        self.current = None
+        self._arrivals = []
+        self._sequence = 0
+        self._idle = False
+        self._events = deque()
+
+    def submit(self, process):
+        if process.arrival < self.time:
+            raise ValueError(f"{process.name} arrives at {process.arrival}, before the current time {self.time}")
+        heapq.heappush(self._arrivals, (process.arrival, self._sequence, process))
+        self._sequence += 1
+
+    def events(self):
+        while self._events:
+            yield self._events.popleft()
+
+    def advance(self, to_time=None):
+        while to_time is None or self.time < to_time:
+            time = self.time
+            current = self.current
+            expired = None
+            if current is not None:
+                if current.remaining == 0:
+                    self._finish(current, time)
+                    current = None
+                elif self._expired(time):
+                    expired, current = current, None
+            if expired is not None and self.REQUEUE_FIRST:
+                self._enqueue(expired)
+
+            while self._arrivals and self._arrivals[0][0] <= time:
+                process = heapq.heappop(self._arrivals)[2]
+                self._events.append((time, 'arrived', process.name))
+                self._enqueue(Job(process))
+            if expired is not None and not self.REQUEUE_FIRST:
+                self._enqueue(expired)
+
+            job = self._pick(current, time)
+            if job is None:
+                if not self._idle:
+                    self._events.append((time, 'idle'))
+                    self._idle = True
+            elif job is not current:
+                if job.start_time is None:
+                    job.start_time = time
+                self._events.append((time, 'selected', job.process.name, job.remaining))
+                self._idle = False
+            self.current = job
+
+            # Run to the next point where something can change
+            candidates = [to_time, self._arrivals[0][0] if self._arrivals else None]
+            if job is not None:
+                candidates += [time + job.remaining, self._slice_end()]
+            candidates = [candidate for candidate in candidates if candidate is not None]
+            if not candidates:
+                break
+            next_time = min(candidates)
+            if job is not None:
+                job.remaining -= next_time - time
+            self.time = next_time
+
+    def _finish(self, job, time):
+        process = job.process
+        wait_time = time - process.arrival - process.burst
+        turnaround_time = time - process.arrival
+        response_time = job.start_time - process.arrival
+        self._events.append((time, 'finished', process.name, wait_time, turnaround_time, response_time))
+
+    # Policy hooks: how ready jobs are queued and which one gets the CPU next
+
+    def _enqueue(self, job):
+        raise NotImplementedError
+
+    def _pick(self, current, time):
+        raise NotImplementedError
+
+    def _expired(self, time):
+        return False
+
+    def _slice_end(self):
+        return None
+
+
+# First-Come, First-Served: a job keeps the CPU until it finishes
+@policy('fcfs')
+class FCFSScheduler(Scheduler):
+    def __init__(self, quantum=None):
+        super().__init__()
+        self._ready = deque()
+
+    def _enqueue(self, job):
+        self._ready.append(job)
+
+    def _pick(self, current, time):
+        if current is None and self._ready:
+            return self._ready.popleft()
+        return current
+
+
+# Preemptive Shortest Job First on the remaining burst; ties go to the job queued first
+@policy('sjf')
+class SJFScheduler(Scheduler):
+    def __init__(self, quantum=None):
+        super().__init__()
+        self._ready = []
+
+    def _enqueue(self, job):
+        heapq.heappush(self._ready, (job.remaining, self._sequence, job))
+        self._sequence += 1
+
+    def _pick(self, current, time):
+        if self._ready and (current is None or self._ready[0][0] < current.remaining):
+            if current is not None:
+                self._enqueue(current)
+            return heapq.heappop(self._ready)[2]
+        return current
+
+
+# Round Robin: a job runs for at most one quantum, then goes to the back of the queue
+@policy('rr')
+class RRScheduler(Scheduler):
+    def __init__(self, quantum=None):
+        if quantum is None or quantum < 1:
+            raise ValueError("Round-Robin needs a quantum of at least 1")
+        super().__init__()
+        self.quantum = quantum
+        self._ready = deque()
+        self._end = None
+
+    def _enqueue(self, job):
+        self._ready.append(job)
+
+    def _pick(self, current, time):
+        if current is None and self._ready:
+            self._end = time + self.quantum
+            return self._ready.popleft()
+        return current
+
+    def _expired(self, time):
+        return time >= self._end
+
+    def _slice_end(self):
+        return self._end
+
+
+# Multilevel Feedback Queue, following engine.mlfq_events: jobs arrive on the top
+# level and move down one level once they have used up its quantum, a job waiting
+# on a higher level preempts the running one, and every `boost` time units all
+# jobs go back to the top level
+@policy('mlfq')
+class MLFQScheduler(Scheduler):
+    # A job leaves its level before the jobs arriving at that time join the top one
+    REQUEUE_FIRST = True
+
+    def __init__(self, quantum=None, quanta=None, boost=None):
+        if quanta is None:
+            quanta = mlfq_quanta(quantum)
+        if not quanta or min(quanta) < 1:
+            raise ValueError("mlfq needs at least one level, each with a quantum of at least 1")
+        if boost is not None and boost < 1:
+            raise ValueError(f"boost must be at least 1, not {boost}")
+        super().__init__()
+        self.quanta = tuple(quanta)
+        self.boost = boost
+        self._queues = [deque() for _ in self.quanta]
+        self._next_boost = boost
+        self._start = None
+        self._end = None
+
+    def _enqueue(self, job):
+        self._queues[job.level].append(job)
+
+    def _pick(self, current, time):
+        if self._next_boost is not None and time >= self._next_boost:
+            top = self._queues[0]
+            for queue in self._queues[1:]:
+                top.extend(queue)
+                queue.clear()
+            for job in top:
+                job.level = job.used = 0
+            if current is not None:
+                current.level = current.used = 0
+                self._start, self._end = time, time + self.quanta[0]
+            self._next_boost = (time // self.boost + 1) * self.boost
+
+        # A preempted job keeps its place at the head of its level
+        if current is not None and any(self._queues[:current.level]):
+            current.used += time - self._start
+            self._queues[current.level].appendleft(current)
+            current = None
+
+        if current is None:
+            for queue in self._queues:
+                if queue:
+                    current = queue.popleft()
+                    self._start, self._end = time, time + self.quanta[current.level] - current.used
+                    break
+        return current
+
+    def _expired(self, time):
+        if time < self._end:
+            return False
+        # Down one level, with that level's whole quantum
+        current = self.current
+        current.level = min(current.level + 1, len(self.quanta) - 1)
+        current.used = 0
+        return True
+
+    def _slice_end(self):
+        if self._next_boost is None:
+            return self._end
+        return min(self._end, self._next_boost)
+
+
+# options are the algorithm's own settings, as algorithm_options() gives them
+def create_scheduler(algorithm, quantum=None, **options):
+    get_algorithm(algorithm)
+    if algorithm not in POLICIES:
+        raise ValueError(f"{algorithm} has no online scheduler")
+    return POLICIES[algorithm](quantum, **options)
+
+
+def format_event(event):
+    time, kind = event[0], event[1]
+    if kind == 'idle':
+        return f"Time {time:3d} : Idle"
+    elif kind == 'selected':
+        return f"Time {time:3d} : {event[2]} selected (burst {event[3]:3d})"
+    elif kind == 'finished':
+        return f"Time {time:3d} : {event[2]} finished\n{event[2]} wait {event[3]:3d} turnaround {event[4]:3d} response {event[5]:3d}"
+    return f"Time {time:3d} : {event[2]} {kind}"
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        names = '|'.join(name for name in ALGORITHMS if name in POLICIES)
+        print(f"Usage: python online.py <{names}> [quantum] < jobs.txt")
+        return
+
+    try:
+        scheduler = create_scheduler(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else None)
+    except ValueError as error:
+        print(error)
+        return
+
+    for line in sys.stdin:
+        fields = line.split()
+        if not fields:
+            continue
+        try:
+            name, arrival, burst = fields[0], int(fields[1]), int(fields[2])
+            # Settle the timeline up to this arrival, then hand the job over
+            scheduler.advance(arrival)
+            scheduler.submit(Process(name, arrival, burst))
+        except (ValueError, IndexError) as error:
+            print(f"Invalid job line {line.strip()!r}: {error}")
+            return
+        for event in scheduler.events():
+            print(format_event(event))
+        sys.stdout.flush()
+
+    scheduler.advance()
+    for event in scheduler.events():
+        print(format_event(event))
+
+if __name__ == "__main__":
+    main()
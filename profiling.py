@@ -0,0 +1,78 @@
+# Opt-in profiling of scheduler runs (`scheduler-gpt.py <file> --profile`).
+#
+# A Profile collects wall time per phase (parse, simulate, render, write) and
+# counters taken from the event records on their way to the renderer.
+# Phase times are exclusive: time spent in a phase nested inside another one is
+# only counted once, for the inner phase. Nothing here runs unless a Profile is
+# passed in, so ordinary runs do not pay for it.
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+PHASES = ('parse', 'simulate', 'render', 'write')
+COUNTERS = ('events', 'idle_ticks', 'selections', 'preemptions', 'context_switches')
+
+
+class Profile:
+    def __init__(self):
+        self.workload = {}
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Time spent in nested phases, one entry per open phase
+        self._nested = []
+
+    @contextmanager
+    def phase(self, name):
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def count_events(self, events):
+        # Pass the event records through, counting as they go. A different process
+        # selected while another one has not finished is a preemption (a quantum
+        # expiring counts too, unless the same process is selected again); a
+        # context switch is the CPU moving to a different process.
+        counters = self.counters
+        running = None
+        last = None
+        for event in events:
+            counters['events'] += 1
+            kind = event[1]
+            if kind == 'selected':
+                counters['selections'] += 1
+                if running is not None and event[2] != running:
+                    counters['preemptions'] += 1
+                if event[2] != last:
+                    counters['context_switches'] += 1
+                running = last = event[2]
+            elif kind == 'finished':
+                if event[2] == running:
+                    running = None
+            elif kind == 'idle':
+                counters['idle_ticks'] += event[3] - event[0]
+            yield event
+
+    def report(self):
+        return {
+            'workload': self.workload,
+            'phases_s': self.phases,
+            'total_s': sum(self.phases.values()),
+            'counters': self.counters,
+        }
+
+    def write(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+            file.write('\n')
+
+
+def phase(profile, name):
+    # profile.phase(name), or a no-op when profiling is off
+    return profile.phase(name) if profile is not None else nullcontext()
@@ -0,0 +1,194 @@
+# The .out report of a run, shared by every entry point.
+#
+# engine.py simulates a run; this module turns its event records and run state
+# into the .out text, line by line, and writes it for an input file:
+#
+#   summary = run_file('workload.in')    # writes workload.out
+#
+# scheduler-gpt.py is the command line around run_file(). Bonus.py, batch.py,
+# server.py and binary_trace.py import from here directly.
+
+from binary_trace import TraceWriter
+from engine import RunState, algorithm_options, get_algorithm, make_processes
+from input_parser import read_workload
+from metrics import DID_NOT_FINISH, NEVER_SELECTED, process_metrics, summarize
+from profiling import phase
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+def calculate_metrics(processes, state, runtime, time_format=None):
+    # The numbers come from the metrics module; this only formats them as text.
+    # time_format(label, number) spells out each time, format_time by default.
+    time_format = time_format or format_time
+    columns = process_metrics(processes, runtime, state)
+    metrics = []
+    for process, status, wait_time, turnaround_time, response_time in zip(processes, columns['status'], columns['wait'], columns['turnaround'], columns['response']):
+        if status == NEVER_SELECTED:
+            metrics.append(f"{process.name} was never selected")
+        elif status == DID_NOT_FINISH:
+            metrics.append(f"{process.name} did not finish")
+        else:
+            # Manually set the white spaces
+            metrics.append(f"{process.name} {time_format('wait', wait_time)} {time_format('turnaround', turnaround_time)} {time_format('response', response_time)}")
+    return metrics
+
+# manually adding the function below to take care of the white space 
+def format_time(string, number): 
+    if string == "processes":
+        number_str = str(number)
+        if len(number_str) == 1:
+            spaces = "  "
+        elif len(number_str) == 2:
+            spaces = " "
+        else:
+            spaces = ""
+        return f"{spaces}{number} {string}"
+    
+    number_str = str(number)
+    if len(number_str) == 1:
+        spaces = "   "
+    elif len(number_str) == 2:
+        spaces = "  "
+    else:
+        spaces = " "
+    return f"{string}{spaces}{number}"
+
+# fifo_scheduler.py and sjf_scheduler.py print their times with a single space
+def plain_time(string, number):
+    return f"{string} {number}"
+
+# The .out lines for the event records of a run (see engine.py for their shape).
+# `end` is appended to every line. The text after each "Time" label is the one
+# event_text() gives, spelled out inline because this is the hot loop of a run.
+def render_events(events, processes, scheduling_algorithm, end=''):
+    names = [p.name for p in processes]
+    idle_line = "Time {:3d} : Idle" + end
+    for time, kind, pid, value in events:
+        if kind == 'idle':
+            yield from map(idle_line.format, range(time, value))
+        elif kind != 'selected':
+            yield f"Time {time:3d} : {names[pid]} {kind}{end}"
+        elif scheduling_algorithm == 'fcfs':
+            # manually fix the white spaces
+            yield f"Time {time:3d} : {names[pid]} selected (burst   {value}){end}"
+        else:
+            yield f"Time {time:3d} : {names[pid]} selected (burst {value:3d}){end}"
+
+# What the .out line of a record says after its "Time" label, for any kind but idle
+def event_text(kind, name, value, scheduling_algorithm):
+    if kind != 'selected':
+        return f"{name} {kind}"
+    elif scheduling_algorithm == 'fcfs':
+        return f"{name} selected (burst   {value})"
+    return f"{name} selected (burst {value:3d})"
+
+def report_header(processes, scheduling_algorithm, time_slice):
+    # manually fix the white spaces
+    yield format_time('processes', len(processes))
+    yield f"Using {get_algorithm(scheduling_algorithm).title}"
+    if scheduling_algorithm == 'rr' and time_slice is not None:
+        yield f"Quantum   {time_slice}\n"
+
+def report_footer(processes, runtime, scheduling_algorithm, state):
+    if scheduling_algorithm == 'fcfs':
+        yield f"Finished at time  {runtime}\n"
+        yield from calculate_metrics(processes, state, runtime)
+    elif scheduling_algorithm == 'rr':
+        yield f"Finished at time  {runtime}\n"
+        for pid in sorted(range(len(processes)), key=lambda pid: (processes[pid].name, processes[pid].arrival)):
+            p = processes[pid]
+            wait_time = (state.finish_time[pid] - p.arrival - p.burst)
+            turnaround_time = state.finish_time[pid] - p.arrival
+            response_time = state.start_time[pid] - p.arrival
+            #manually set the white spaces
+            yield f"{p.name} {format_time('wait', wait_time)} {format_time('turnaround', turnaround_time)} {format_time('response', response_time)}"
+    else:
+        yield f"Finished at time {runtime:3d}\n"
+        yield from calculate_metrics(processes, state, runtime)
+
+# The .out text of a run, line by line, around its event records
+def schedule_report(processes, runtime, scheduling_algorithm, time_slice, state, events):
+    yield from report_header(processes, scheduling_algorithm, time_slice)
+    yield from render_events(events, processes, scheduling_algorithm)
+    yield from report_footer(processes, runtime, scheduling_algorithm, state)
+
+# Simulate a run with any registered algorithm and return its .out lines
+def simulate_report(processes, runtime, scheduling_algorithm, time_slice=None, state=None, options=None):
+    if state is None:
+        state = RunState(processes)
+    events = get_algorithm(scheduling_algorithm).events(processes, runtime, state, time_slice, **(options or {}))
+    return schedule_report(processes, runtime, scheduling_algorithm, time_slice, state, events)
+
+# Write the .out text for one parsed workload to an open text file, and record its
+# events to a binary trace as well when a TraceWriter is given. options are the
+# algorithm's own settings, from algorithm_options()
+def write_schedule(file, processes, runtime, scheduling_algorithm, time_slice, state, trace=None, profile=None, options=None):
+    # The `use` line picks the algorithm from the engine's registry
+    events = get_algorithm(scheduling_algorithm).events(processes, runtime, state, time_slice, **(options or {}))
+
+    if trace is not None:
+        events = trace.record(events)
+    if profile is not None:
+        # Profiled runs take the stages one after another, so each can be timed on its own
+        with profile.phase('simulate'):
+            events = list(profile.count_events(events))
+        with profile.phase('render'):
+            lines = [f"{line}\n" for line in report_header(processes, scheduling_algorithm, time_slice)]
+            lines.extend(render_events(events, processes, scheduling_algorithm, end='\n'))
+            lines.extend(f"{line}\n" for line in report_footer(processes, runtime, scheduling_algorithm, state))
+        with profile.phase('write'):
+            file.writelines(lines)
+            file.flush()
+    else:
+        # stream the lines as they are rendered instead of joining one big string
+        file.writelines(f"{line}\n" for line in report_header(processes, scheduling_algorithm, time_slice))
+        file.writelines(render_events(events, processes, scheduling_algorithm, end='\n'))
+        file.writelines(f"{line}\n" for line in report_footer(processes, runtime, scheduling_algorithm, state))
+    if trace is not None:
+        trace.finish(processes, state)
+
+# Simulate one input file and write its .out next to it. Returns the aggregate
+# metrics of the run; raises ValueError for unusable input. With a ResultCache,
+# a workload that was simulated before is copied from the cache instead. With
+# trace=True a binary event trace is written next to the .out as well, and a
+# Profile passed as profile collects phase timings and counters for the run.
+def run_file(input_file, cache=None, trace=False, profile=None):
+    try:
+        with phase(profile, 'parse'):
+            workload = read_workload(input_file)
+    except ValueError as error:
+        raise ValueError(f"Invalid input file: {error}") from error
+    options = algorithm_options(workload)
+
+    output_file = input_file.split('.')[0] + '.out'
+    if cache is not None:
+        key = cache.key(workload)
+        # The cache holds no traces or timings, so traced and profiled runs are always simulated
+        summary = None if trace or profile is not None else cache.get(key, output_file)
+        if summary is not None:
+            return summary
+
+    processes = make_processes(workload)
+    runtime = workload.runfor
+    state = RunState(processes)
+    if profile is not None:
+        profile.workload = {'input': input_file, 'algorithm': workload.algorithm, 'quantum': workload.quantum, 'processes': len(processes), 'runfor': runtime}
+    with open(output_file, 'w', buffering=OUTPUT_BUFFER_SIZE) as file:
+        if trace:
+            with TraceWriter(input_file.split('.')[0] + '.trace', workload.algorithm, workload.quantum, runtime) as writer:
+                write_schedule(file, processes, runtime, workload.algorithm, workload.quantum, state, writer, profile, options)
+        else:
+            write_schedule(file, processes, runtime, workload.algorithm, workload.quantum, state, profile=profile, options=options)
+    summary = summarize(processes, runtime, state=state)
+
+    if cache is not None:
+        cache.put(key, output_file, summary)
+    return summary
+
+# Write a report's lines to output_file, separated rather than ended by newlines,
+# as fifo_scheduler.py and sjf_scheduler.py always have
+def write_output_file(output_file, output):
+    with open(output_file, 'w', buffering=OUTPUT_BUFFER_SIZE) as file:
+        output = iter(output)
+        file.write(next(output, ''))
+        file.writelines(f"\n{line}" for line in output)
@@ -0,0 +1,145 @@
+# Content-addressed cache of simulation results.
+#
+# An entry is keyed by a SHA-256 over the parsed workload (process names,
+# arrivals and bursts in input order, runfor, use, the quantum for rr and the
+# settings of algorithms that have their own, such as mlfq's quanta) and
+# over the scheduler source. The same workload therefore hits however its .in
+# file is laid out, and any change to the scheduler code starts a fresh set of
+# keys. An entry holds the .out text and the summary metrics of the run.
+#
+# The store is a plain directory. A hit refreshes the entry's mtime, and once
+# the store grows past max_bytes the least recently used entries are removed.
+# Entries are written to a temporary name and renamed into place, so several
+# processes can share one store.
+
+import hashlib
+import json
+import os
+import shutil
+from array import array
+
+from engine import algorithm_options
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'scheduler-gpt')
+DEFAULT_MAX_BYTES = 256 << 20
+# After an eviction the store is trimmed to this fraction of max_bytes, so the
+# next few writes do not each trigger another pass over the directory
+EVICT_TO = 0.8
+
+# Source files whose behaviour is baked into a cached result
+ENGINE_FILES = ('report.py', 'engine.py', 'metrics.py')
+
+
+def _engine_digest():
+    digest = hashlib.sha256()
+    for name in ENGINE_FILES:
+        with open(os.path.join(REPO_ROOT, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.digest()
+
+
+ENGINE_DIGEST = _engine_digest()
+
+
+def workload_key(workload):
+    digest = hashlib.sha256(ENGINE_DIGEST)
+    # The quantum only changes the output of rr
+    quantum = workload.quantum if workload.algorithm == 'rr' else None
+    options = sorted(algorithm_options(workload).items())
+    digest.update(repr((workload.runfor, workload.algorithm, quantum, options, len(workload.names))).encode())
+    digest.update('\n'.join(workload.names).encode())
+    digest.update(array('q', workload.arrival).tobytes())
+    digest.update(array('q', workload.burst).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Size of the store as this process last saw it, measured on the first write
+        self._size = None
+
+    def key(self, workload):
+        return workload_key(workload)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, output_file):
+        # Copy the cached .out to output_file and return the cached summary, or None on a miss
+        summary_file = self._path(key, '.json')
+        try:
+            with open(summary_file) as file:
+                summary = json.load(file)
+            shutil.copyfile(self._path(key, '.out'), output_file)
+            os.utime(summary_file)
+        except (OSError, ValueError):
+            return None
+        return summary
+
+    def put(self, key, output_file, summary):
+        # A cache that cannot be written to only costs the speedup, never the run
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Rewriting an entry that is already stored only adds the difference
+            replaced = self._stored_size(key)
+            temporary = self._path(key, f'.{os.getpid()}.tmp')
+            shutil.copyfile(output_file, temporary)
+            os.replace(temporary, self._path(key, '.out'))
+            with open(temporary, 'w') as file:
+                json.dump(summary, file)
+            # The summary goes in last: an entry without one is a miss
+            os.replace(temporary, self._path(key, '.json'))
+            added = self._stored_size(key) - replaced
+        except OSError:
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += added
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _stored_size(self, key):
+        # Bytes the store holds for key, 0 for an entry that is not there
+        size = 0
+        for suffix in ('.out', '.json'):
+            try:
+                size += os.path.getsize(self._path(key, suffix))
+            except OSError:
+                pass
+        return size
+
+    def _entries(self):
+        # (last use, size, key) for every complete entry in the store
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith('.json'):
+                    continue
+                key = entry.name[:-len('.json')]
+                try:
+                    stat = entry.stat()
+                    size = stat.st_size + os.path.getsize(self._path(key, '.out'))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, size, key))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, entry_size, key in entries:
+            if size <= target:
+                break
+            for suffix in ('.json', '.out'):
+                try:
+                    os.remove(self._path(key, suffix))
+                except OSError:
+                    pass
+            size -= entry_size
+        self._size = size
@@ -1,99 +1,32 @@
 import sys
-from collections import deque
 
-class Process:
-    def __init__(self, name: str, arrival: int, burst: int):
-        self.name = name
-        self.arrival = arrival
-        self.burst = burst
-        self.remaining_time = burst
-        self.start_time = -1
-        self.finish_time = -1
-    
-    def __repr__(self):
-        return f"Process(name='{self.name}', arrival={self.arrival}, burst={self.burst})"
-    
-    def __str__(self):
-        return f"Process {self.name}: Arrival Time = {self.arrival}, Burst Time = {self.burst}"
+from engine import RunState, algorithm_options, make_processes, round_robin_events
+from input_parser import read_workload
+
+def print_scheduling(scheduled, processes, run_for, state):
+    # The schedule comes from the shared engine; only its format is particular to this script.
+    # Idle is only shown once every process has finished, one line per tick up to run_for.
+    for time, kind, pid, value in scheduled:
+        if kind == "arrived":
+            print(f"Time {time:>3} : {processes[pid].name} arrived")
+        elif kind == "selected":
+            print(f"Time {time:>3} : {processes[pid].name} selected (burst {value:>3})")
+        elif kind == "finished":
+            print(f"Time {time:>3} : {processes[pid].name} finished")
+    start_time = [-1 if time is None else time for time in state.start_time]
+    finish_time = [-1 if time is None else time for time in state.finish_time]
+    if -1 not in finish_time:
+        for idle_time in range(max(finish_time, default=0) + 1, run_for + 1):
+            print(f"Time {idle_time:>3} : Idle")
 
-def round_robin_scheduling(processes, time_slice, run_for):
-    queue = deque()
-    processes.sort(key=lambda x: x.arrival)
-    time = 0  # Start time at 0
-    scheduled = []
-    process_map = {p.name: p for p in processes}
-
-    while time < run_for:
-        # Add all processes that have arrived by the current time to the queue
-        while processes and processes[0].arrival <= time:
-            arriving_process = processes.pop(0)
-            scheduled.append((time, arriving_process.name, "arrived"))
-            queue.append(arriving_process)
-
-        if queue:
-            current_process = queue.popleft()
-            if current_process.start_time == -1:
-                current_process.start_time = time
-
-            run_time = min(current_process.remaining_time, time_slice)
-            scheduled.append((time, current_process.name, "selected", current_process.remaining_time))
-
-            # Execute the current process for the time slice or until it finishes
-            for _ in range(run_time):
-                time += 1
-                current_process.remaining_time -= 1
-
-                # Check for newly arriving processes during execution
-                while processes and processes[0].arrival <= time:
-                    arriving_process = processes.pop(0)
-                    scheduled.append((time, arriving_process.name, "arrived"))
-                    queue.append(arriving_process)
-
-                # If the current time exceeds the run_for limit, stop execution
-                if time >= run_for:
-                    break
-
-            if current_process.remaining_time == 0:
-                current_process.finish_time = time
-                scheduled.append((time, current_process.name, "finished"))
-            else:
-                queue.append(current_process)
-        else:
-            if processes:
-                time = processes[0].arrival
-            else:
-                time += 1
-                scheduled.append((time, "Idle"))
-
-    return scheduled, time, process_map
-
-def print_scheduling(scheduled, total_time, processes, process_map=None):
-    for event in scheduled:
-        if len(event) == 2 and event[1] == "Idle":
-            print(f"Time {event[0]:>3} : Idle")
-        elif event[2] == "arrived":
-            print(f"Time {event[0]:>3} : {event[1]} arrived")
-        elif event[2] == "selected":
-            print(f"Time {event[0]:>3} : {event[1]} selected (burst {event[3]:>3})")
-        elif event[2] == "finished":
-            print(f"Time {event[0]:>3} : {event[1]} finished")
-            process = next((p for p in processes if p.name == event[1]), None)
-            if process:
-                wait_time = (process.finish_time - process.arrival - process.burst)
-                turnaround_time = process.finish_time - process.arrival
-                response_time = process.start_time - process.arrival
-                print(f"{process.name} wait {wait_time:>3} turnaround {turnaround_time:>3} response {response_time:>3}")
-    
-    if total_time < run_for:
-        print(f"Time {total_time}: Idle")
     print(f"Finished at time {run_for}\n")
 
-    if process_map:
-        for p in sorted(process_map.values(), key=lambda x: x.name):
-            wait_time = (p.finish_time - p.arrival - p.burst)
-            turnaround_time = p.finish_time - p.arrival
-            response_time = p.start_time - p.arrival
-            print(f"{p.name} wait {wait_time} turnaround {turnaround_time} response {response_time}")
+    for pid in sorted(range(len(processes)), key=lambda pid: (processes[pid].name, processes[pid].arrival)):
+        p = processes[pid]
+        wait_time = (finish_time[pid] - p.arrival - p.burst)
+        turnaround_time = finish_time[pid] - p.arrival
+        response_time = start_time[pid] - p.arrival
+        print(f"{p.name} wait {wait_time} turnaround {turnaround_time} response {response_time}")
 
 
 def main():
@@ -102,40 +35,29 @@ def main():
         return
 
     input_file = sys.argv[1]
-    
-    processes = []
-    time_slice = None
-    algorithm = None
-    global run_for
-    run_for = 0
-
-    with open(input_file, 'r') as file:
-        for line in file:
-            parts = line.strip().split()
-            if parts[0] == "processcount":
-                process_count = int(parts[1])
-            elif parts[0] == "runfor":
-                run_for = int(parts[1])
-            elif parts[0] == "use":
-                algorithm = parts[1]
-            elif parts[0] == "quantum":
-                time_slice = int(parts[1])
-            elif parts[0] == "process":
-                name = parts[2]
-                arrival = int(parts[4])
-                burst = int(parts[6])
-                processes.append(Process(name, arrival, burst))
-            elif parts[0] == "end":
-                break
+    try:
+        workload = read_workload(input_file)
+    except ValueError as error:
+        print("Invalid input file:", error)
+        return
+    if workload.algorithm == "rr":
+        try:
+            algorithm_options(workload)
+        except ValueError as error:
+            print(error)
+            return
+    processes = make_processes(workload)
+    time_slice = workload.quantum
+    run_for = workload.runfor
 
     print(f"{len(processes)} processes")
 
-    if algorithm == "rr":
+    if workload.algorithm == "rr":
         print("Using Round Robin Scheduling")
         if time_slice is not None:
             print(f"Quantum {time_slice}\n")
-        scheduled, total_time, process_map = round_robin_scheduling(processes, time_slice, run_for)
-        print_scheduling(scheduled, total_time, processes, process_map)
+        state = RunState(processes)
+        print_scheduling(round_robin_events(processes, run_for, state, time_slice), processes, run_for, state)
 
 if __name__ == "__main__":
     main()
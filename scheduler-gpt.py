@@ -5,338 +5,28 @@
 # Megan Bailey
 
 import sys
-from collections import deque
 
-# First-Come, First-Served (FIFO)
-class Process:
-    def __init__(self, name: str, arrival: int, burst: int):
-        self.name = name
-        self.arrival = arrival
-        self.burst = burst
-        self.remaining_burst = burst
-        self.start_time = None
-        self.finish_time = None
-
-    def __repr__(self):
-        return f"Process(name='{self.name}', arrival={self.arrival}, burst={self.burst})"
-
-def calculate_metrics(processes, runtime):
-    metrics = []
-    for process in processes:
-        if process.start_time is None:
-            metrics.append(f"{process.name} was never selected")
-        elif process.finish_time is None or process.finish_time > runtime:
-            metrics.append(f"{process.name} did not finish")
-        else:
-            # Fix the calculation of wait time
-            wait_time = process.finish_time - process.arrival - process.burst
-            turnaround_time = process.finish_time - process.arrival
-            response_time = process.start_time - process.arrival
-            # Manually set the white spaces
-            metrics.append(f"{process.name} {format_time('wait', wait_time)} {format_time('turnaround', turnaround_time)} {format_time('response', response_time)}")
-    return metrics
-
-# manually adding the function below to take care of the white space 
-def format_time(string, number): 
-    if string == "processes":
-        number_str = str(number)
-        if len(number_str) == 1:
-            spaces = "  "
-        elif len(number_str) == 2:
-            spaces = " "
-        else:
-            spaces = ""
-        return f"{spaces}{number} {string}"
-    
-    number_str = str(number)
-    if len(number_str) == 1:
-        spaces = "   "
-    elif len(number_str) == 2:
-        spaces = "  "
-    else:
-        spaces = " "
-    return f"{string}{spaces}{number}"
-
-
-def fifo_scheduling(processes, runtime):
-    output = []
-    # manually fix the white spaces
-    output.append(format_time('processes', len(processes)))
-    output.append("Using First-Come First-Served")
-
-    sorted_processes = sorted(processes, key=lambda x: x.arrival)
-    current_time = 0
-    event_log = []
-
-    for process in sorted_processes:
-        event_log.append((process.arrival, 'arrived', process.name))
-        if current_time < process.arrival:
-            current_time = process.arrival
-        
-        process.start_time = current_time
-        process.finish_time = process.start_time + process.burst
-        event_log.append((process.start_time, 'selected', process.name, process.burst))
-        event_log.append((process.finish_time, 'finished', process.name))
-        current_time = process.finish_time
-
-    event_log.sort(key=lambda x: (x[0], {'arrived': 0, 'finished': 1, 'selected': 2}[x[1]]))
-    selected_processes = set()
-    for time in range(runtime):
-        events_at_time = [event for event in event_log if event[0] == time]
-        if events_at_time:
-            for event in events_at_time:
-                if event[1] == 'arrived':
-                    output.append(f"{format_time('Time', time)} : {event[2]} {event[1]}")
-                elif event[1] == 'finished':
-                    selected_processes.discard(event[2])
-                    output.append(f"{format_time('Time',time)} : {event[2]} {event[1]}")
-                    if [e[0] for e in event_log].count(time) == 1 and not selected_processes:
-                        output.append(f"{format_time('Time', time)} : Idle")
-                elif event[1] == 'selected':
-                    selected_processes.add(event[2])
-                    output.append(f"{format_time('Time', time)} : {event[2]} {event[1]} (burst   {event[3]})")
-        else:
-            if not selected_processes:
-                output.append(f"{format_time('Time', time)} : Idle")
-
-    output.append(f"Finished at time  {runtime}\n")
-    output.extend(calculate_metrics(processes, runtime))
-
-    return output
-
-# Pre-emptive Shortest Job First (SJF)
-def preemptive_sjf(original_processes, runtime):
-    output = []
-    # manually fix the white space
-    
-    output.append(format_time('processes', len(original_processes)))
-    output.append("Using preemptive Shortest Job First")
-
-    processes = original_processes.copy()
-    processes.sort(key=lambda x: x.arrival)
-    current_time = 0
-    ready_queue = []
-    current_process = None
-    event_log = []
-
-    while current_time < runtime:
-        while processes and processes[0].arrival <= current_time:
-            process = processes.pop(0)
-            ready_queue.append(process)
-            event_log.append((current_time, 'arrived', process.name))
-
-        if ready_queue:
-            ready_queue.sort(key=lambda x: x.remaining_burst)
-            if not current_process or (ready_queue and ready_queue[0].remaining_burst < current_process.remaining_burst):
-                if current_process:
-                    ready_queue.append(current_process)
-                current_process = ready_queue.pop(0)
-                if current_process.start_time is None:
-                    current_process.start_time = current_time
-                event_log.append((current_time, 'selected', current_process.name, current_process.remaining_burst))
-
-        if current_process:
-            current_process.remaining_burst -= 1
-            if current_process.remaining_burst == 0:
-                current_process.finish_time = current_time + 1
-                event_log.append((current_time + 1, 'finished', current_process.name))
-                current_process = None
-
-        current_time += 1
-        if current_process is None and not ready_queue and not any(process.arrival <= current_time for process in processes):
-            event_log.append((current_time, 'idle'))
-
-    event_log.sort(key=lambda x: (x[0], {'arrived': 0, 'finished': 1, 'selected': 2, 'idle': 3}[x[1]]))
-    for time in range(runtime):
-        events_at_time = [event for event in event_log if event[0] == time]
-        if events_at_time:
-            for event in events_at_time:
-                if event[1] == 'arrived':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]}")
-                elif event[1] == 'finished':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]}")
-                elif event[1] == 'selected':
-                    output.append(f"Time {time:3d} : {event[2]} {event[1]} (burst {event[3]:3d})")
-                elif event[1] == 'idle':
-                    output.append(f"Time {time:3d} : Idle")
-
-    output.append(f"Finished at time {runtime:3d}\n")
-    metrics = calculate_metrics(original_processes, runtime)
-    output.extend(metrics)
-
-    return output
-
-# Round Robin (RR)
-def round_robin_scheduling(processes, time_slice, run_for):
-    queue = deque()
-    processes.sort(key=lambda x: x.arrival)
-    time = 0
-    scheduled = []
-    process_map = {p.name: p for p in processes}
-
-    while time < run_for:
-        while processes and processes[0].arrival <= time:
-            arriving_process = processes.pop(0)
-            scheduled.append((time, arriving_process.name, "arrived"))
-            queue.append(arriving_process)
-
-        if queue:
-            current_process = queue.popleft()
-            if current_process.start_time is None:
-                current_process.start_time = time
-
-            run_time = min(current_process.remaining_burst, time_slice)
-            scheduled.append((time, current_process.name, "selected", current_process.remaining_burst))
-
-            for _ in range(run_time):
-                time += 1
-                current_process.remaining_burst -= 1
-                while processes and processes[0].arrival <= time:
-                    arriving_process = processes.pop(0)
-                    scheduled.append((time, arriving_process.name, "arrived"))
-                    queue.append(arriving_process)
-
-                if time >= run_for:
-                    break
-
-            if current_process.remaining_burst == 0:
-                current_process.finish_time = time
-                scheduled.append((time, current_process.name, "finished"))
-                if time < run_for and (not queue and not any(process.arrival <= time for process in processes)):
-                    scheduled.append((time, "Idle"))  # Add idle only if no process is ready to run
-            else:
-                queue.append(current_process)
-        else:
-            if processes:
-                time = processes[0].arrival
-            else:
-                time += 1
-                if time < run_for:  # Ensure Idle is added only within the run_for time
-                    scheduled.append((time, "Idle"))
-
-    return scheduled, time, process_map
-
-def print_scheduling(scheduled, total_time, processes, run_for, process_map=None):
-    for event in scheduled:
-        if len(event) == 2 and event[1] == "Idle":
-            print(f"Time {event[0]:>3} : Idle")
-        elif event[2] == "arrived":
-            print(f"Time {event[0]:>3} : {event[1]} arrived")
-        elif event[2] == "selected":
-            print(f"Time {event[0]:>3} : {event[1]} selected (burst {event[3]:>3})")
-        elif event[2] == "finished":
-            print(f"Time {event[0]:>3} : {event[1]} finished")
-            process = next((p for p in processes if p.name == event[1]), None)
-            if process:
-                wait_time = (process.finish_time - process.arrival - process.burst)
-                turnaround_time = process.finish_time - process.arrival
-                response_time = process.start_time - process.arrival
-                print(f"{process.name} wait   {wait_time:>3} turnaround   {turnaround_time:>3} response   {response_time:>3}")
-    
-    if total_time < run_for:
-        print(f"Time {total_time}: Idle")
-    print(f"Finished at time {run_for}\n")
-
-    if process_map:
-        for p in sorted(process_map.values(), key=lambda x: x.name):
-            wait_time = (p.finish_time - p.arrival - p.burst)
-            turnaround_time = p.finish_time - p.arrival
-            response_time = p.start_time - p.arrival
-            print(f"{p.name} {format_time('wait', wait_time)} {format_time('turnaround', turnaround_time)} {format_time('response', response_time)}")
-            
-            
-def parse_input_file(filename):
-    processes = []
-    runtime = None
-    scheduling_algorithm = None
-    time_slice = None
-
-    with open(filename, 'r') as file:
-        for line in file:
-            parts = line.split()
-            if parts[0] == 'processcount':
-                process_count = int(parts[1])
-            elif parts[0] == 'runfor':
-                runtime = int(parts[1])
-            elif parts[0] == 'use':
-                scheduling_algorithm = parts[1]
-            elif parts[0] == 'quantum':
-                time_slice = int(parts[1])
-            elif parts[0] == 'process':
-                name = parts[2]
-                arrival = int(parts[4])
-                burst = int(parts[6])
-                processes.append(Process(name, arrival, burst))
-            elif parts[0] == 'end':
-                break
-
-    return processes, runtime, scheduling_algorithm, time_slice
-
-def write_output_file(filename, output):
-    output_file = filename.split('.')[0] + '.out'
-    with open(output_file, 'w') as file:
-        file.write('\n'.join(output))
-        # manually add new line at the end
-        file.write('\n')
-
-def write_scheduling_to_file(file, scheduled, total_time, processes, run_for, process_map=None):
-    for event in scheduled:
-        if len(event) == 2 and event[1] == "Idle":
-            file.write(f"Time {event[0]:>3} : Idle\n")
-        elif event[2] == "arrived":
-            file.write(f"Time {event[0]:>3} : {event[1]} arrived\n")
-        elif event[2] == "selected":
-            file.write(f"Time {event[0]:>3} : {event[1]} selected (burst {event[3]:>3})\n")
-        elif event[2] == "finished":
-            file.write(f"Time {event[0]:>3} : {event[1]} finished\n")
-            process = next((p for p in processes if p.name == event[1]), None)
-            if process:
-                wait_time = (process.finish_time - process.arrival - process.burst)
-                turnaround_time = process.finish_time - process.arrival
-                response_time = process.start_time - process.arrival
-                file.write(f"{process.name} wait {wait_time:>3} turnaround {turnaround_time:>3} response {response_time:>3}\n")
-    
-    if total_time < run_for:
-        file.write(f"Time {total_time}: Idle\n")
-    file.write(f"Finished at time  {run_for}\n\n")
-
-    if process_map:
-        for p in sorted(process_map.values(), key=lambda x: x.name):
-            wait_time = (p.finish_time - p.arrival - p.burst)
-            turnaround_time = p.finish_time - p.arrival
-            response_time = p.start_time - p.arrival
-            #manually set the white spaces
-            file.write(f"{p.name} {format_time('wait', wait_time)} {format_time('turnaround', turnaround_time)} {format_time('response', response_time)}\n")
+from profiling import Profile
+from report import run_file
+from result_cache import ResultCache
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scheduler.py <input_file>")
+    flags = sys.argv[2:]
+    if len(sys.argv) < 2 or any(flag not in ('--no-cache', '--trace', '--profile') for flag in flags):
+        print("Usage: python scheduler.py <input_file> [--no-cache] [--trace] [--profile]")
         return
 
-    input_file = sys.argv[1]
-    processes, runtime, scheduling_algorithm, time_slice = parse_input_file(input_file)
-
-    if scheduling_algorithm == 'fcfs':
-        output = fifo_scheduling(processes, runtime)
-        write_output_file(input_file, output)
-    elif scheduling_algorithm == 'sjf':
-        output = preemptive_sjf(processes, runtime)
-        write_output_file(input_file, output)
-    elif scheduling_algorithm == 'rr':
-        output_file = input_file.split('.')[0] + '.out'
-        with open(output_file, 'w') as file:
-            #manully add this line to the output
-            file.write(format_time('processes', len(processes)) + '\n')
-            #manully set this sentence
-            file.write("Using Round-Robin\n")
-            if time_slice is not None:
-                file.write(f"Quantum   {time_slice}\n\n")
-            scheduled, total_time, process_map = round_robin_scheduling(processes, time_slice, runtime)
-            write_scheduling_to_file(file, scheduled, total_time, processes, runtime, process_map)
-    else:
-        print("Unsupported scheduling algorithm:", scheduling_algorithm)
+    # --no-cache always simulates, and leaves the result cache untouched
+    cache = None if '--no-cache' in flags else ResultCache()
+    # --profile writes phase timings and counters to <input>.profile.json
+    profile = Profile() if '--profile' in flags else None
+    try:
+        run_file(sys.argv[1], cache, trace='--trace' in flags, profile=profile)
+    except ValueError as error:
+        print(error)
+        return
+    if profile is not None:
+        profile.write(sys.argv[1].split('.')[0] + '.profile.json')
 
 if __name__ == "__main__":
     main()
-
-
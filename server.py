@@ -0,0 +1,161 @@
+# Serve scheduling simulations over a local socket.
+#
+#   python server.py [--host 127.0.0.1] [--port 8642 | --unix PATH] [--workers N] [--max-concurrent N]
+#
+# A client connects, sends one workload, in the .in text format or as JSON (see
+# input_parser.parse_workload_json), and shuts down its sending side. The server
+# streams back exactly the text the .out file would hold and closes the
+# connection. A workload that cannot be simulated gets one "error: ..." line
+# instead.
+#
+# Simulations run in a process pool, so the event loop only moves bytes. A worker
+# sends the text back through a pipe as it writes it, and the event loop passes
+# it on to the client, so a report is never held in memory as a whole; a slow
+# client holds up its worker instead. At most --max-concurrent simulations are in
+# flight at once; later clients wait their turn.
+# bench/load_test.py drives the server with many concurrent clients.
+
+import argparse
+import asyncio
+import io
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.reduction import ForkingPickler
+
+from engine import RunState, algorithm_options, make_processes
+from input_parser import parse_workload, parse_workload_json
+from report import write_schedule
+
+DEFAULT_PORT = 8642
+MAX_REQUEST_SIZE = 256 << 20
+CHUNK_SIZE = 1 << 16
+
+
+# The raw file under a worker's text output: every write goes down the pipe as one message
+class PipeWriter(io.RawIOBase):
+    def __init__(self, connection):
+        self._connection = connection
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._connection.send_bytes(data)
+        return len(data)
+
+
+def simulate(data, sender):
+    # Runs in a worker process and sends the .out text through the pipe end
+    # pickled in `sender`, about CHUNK_SIZE bytes at a time, closing it when done
+    with pickle.loads(sender) as connection:
+        if data.lstrip()[:1] == b'{':
+            workload = parse_workload_json(data)
+        else:
+            workload = parse_workload(data)
+        options = algorithm_options(workload)
+        processes = make_processes(workload)
+        with io.TextIOWrapper(io.BufferedWriter(PipeWriter(connection), CHUNK_SIZE), encoding='utf-8', newline='\n') as output:
+            write_schedule(output, processes, workload.runfor, workload.algorithm, workload.quantum, RunState(processes), options=options)
+
+
+async def stream_simulation(writer, executor, data):
+    loop = asyncio.get_running_loop()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    with sender:
+        # Pickled now rather than by the executor later, so the worker's copy of the
+        # sending end exists before this one is closed. The pipe then reaches its end
+        # as soon as the worker is done with it, or has died.
+        sender = bytes(ForkingPickler.dumps(sender))
+    with receiver:
+        future = loop.run_in_executor(executor, simulate, data, sender)
+        try:
+            while True:
+                try:
+                    chunk = await loop.run_in_executor(None, receiver.recv_bytes)
+                except EOFError:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        except BaseException:
+            # With nobody reading the pipe, the worker stops at its next write
+            receiver.close()
+            await asyncio.wait([future])
+            raise
+    # Raises what the worker raised, after whatever text it sent before that
+    await future
+
+
+async def read_request(reader):
+    chunks = []
+    size = 0
+    while chunk := await reader.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_REQUEST_SIZE:
+            raise ValueError(f"workload larger than {MAX_REQUEST_SIZE} bytes")
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+async def handle_client(reader, writer, executor, slots):
+    try:
+        try:
+            data = await read_request(reader)
+            async with slots:
+                await stream_simulation(writer, executor, data)
+        except ConnectionError:
+            raise
+        except Exception as error:
+            # A bad request, or a worker that failed on it, is answered with the error as text
+            writer.write(f"error: {type(error).__name__}: {error}\n".encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(args):
+    workers = args.workers or os.cpu_count() or 1
+    # Workers are started on demand, once clients are connected. Forked workers would
+    # inherit those client sockets and keep them open after the server closes them,
+    # so they come from a fork server instead.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver')) as executor:
+        slots = asyncio.Semaphore(args.max_concurrent or workers)
+
+        async def on_connect(reader, writer):
+            await handle_client(reader, writer, executor, slots)
+
+        if args.unix:
+            if os.path.exists(args.unix):
+                os.unlink(args.unix)
+            server = await asyncio.start_unix_server(on_connect, path=args.unix)
+            print("Serving on", args.unix, flush=True)
+        else:
+            server = await asyncio.start_server(on_connect, host=args.host, port=args.port)
+            print("Serving on", ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets), flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve scheduling simulations over a local socket.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--max-concurrent', type=int, default=None, help="simulations in flight at once (default: one per worker)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Parameter sweep: run one workload under many scheduler configurations.
+#
+#   python sweep.py <input_file> [--quanta 1-10,16,32] [--all-algorithms] [--workers N] [--csv FILE]
+#
+# The input is parsed once. Each worker gets the parsed columns once, through the
+# pool initializer, and builds its processes from them a single time; every
+# configuration then runs over those same processes with its own run state.
+# The result is a table of average wait/turnaround/response per configuration.
+
+import argparse
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import make_processes, run_algorithm
+from input_parser import read_workload
+from metrics import summarize
+
+FIELDS = ['algorithm', 'quantum', 'finished', 'avg_wait', 'avg_turnaround', 'avg_response', 'p95_wait', 'throughput']
+
+# The workload each worker process sweeps over, set once by the pool initializer
+_workload = None
+_processes = None
+
+
+def set_workload(workload):
+    global _workload, _processes
+    _workload = workload
+    _processes = make_processes(workload)
+
+
+# argparse type for --quanta; Round-Robin needs every quantum to be at least 1
+def parse_quanta(spec):
+    quanta = []
+    for part in spec.split(','):
+        if '-' in part:
+            low, high = part.split('-')
+            quanta.extend(range(int(low), int(high) + 1))
+        elif part:
+            quanta.append(int(part))
+    if not quanta:
+        raise argparse.ArgumentTypeError(f"no quanta given: {spec!r}")
+    if min(quanta) < 1:
+        raise argparse.ArgumentTypeError(f"quanta must be at least 1: {spec!r}")
+    return sorted(set(quanta))
+
+
+def simulate(config):
+    algorithm, quantum = config
+    runtime = _workload.runfor
+    # Only the metrics are needed, so no text is rendered at all
+    state = run_algorithm(_processes, runtime, algorithm, quantum)
+    summary = summarize(_processes, runtime, state=state)
+
+    return {
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'finished': summary['finished'],
+        'avg_wait': summary['wait']['mean'],
+        'avg_turnaround': summary['turnaround']['mean'],
+        'avg_response': summary['response']['mean'],
+        'p95_wait': summary['wait']['p95'],
+        'throughput': summary['throughput'],
+    }
+
+
+def run_sweep(workload, configs, workers):
+    if workers == 1:
+        set_workload(workload)
+        return [simulate(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_workload, initargs=(workload,)) as executor:
+        return list(executor.map(simulate, configs))
+
+
+def format_table(rows):
+    def cell(value):
+        if value is None:
+            return '-'
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    lines = [f"{'algorithm':>9} {'quantum':>7} {'finished':>8} {'avg wait':>10} {'avg turnaround':>14} {'avg response':>12} {'p95 wait':>10}"]
+    for row in rows:
+        lines.append(f"{row['algorithm']:>9} {cell(row['quantum']):>7} {row['finished']:>8} {cell(row['avg_wait']):>10} "
+                     f"{cell(row['avg_turnaround']):>14} {cell(row['avg_response']):>12} {cell(row['p95_wait']):>10}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scheduler configurations on one workload.")
+    parser.add_argument('input_file')
+    parser.add_argument('--quanta', type=parse_quanta, default='1-10', help="rr quanta to try, e.g. 1-10,16,32 (default: 1-10)")
+    parser.add_argument('--all-algorithms', action='store_true', help="also run fcfs and sjf")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--csv', default=None, help="also write the table as CSV")
+    args = parser.parse_args()
+
+    try:
+        workload = read_workload(args.input_file)
+    except ValueError as error:
+        print("Invalid input file:", error)
+        return
+
+    configs = [('rr', quantum) for quantum in args.quanta]
+    if args.all_algorithms:
+        configs = [('fcfs', None), ('sjf', None)] + configs
+    rows = run_sweep(workload, configs, args.workers)
+    print(format_table(rows))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+if __name__ == "__main__":
+    main()
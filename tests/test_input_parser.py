@@ -0,0 +1,21 @@
+# The chunked scan in input_parser has to give the same workload wherever the
+# chunk boundaries fall.
+
+import pytest
+
+import input_parser
+from input_parser import parse_workload
+
+PLAIN = b"".join(b"process name P%d arrival %d burst %d\n" % (i, i * 3, i % 5 + 1) for i in range(40))
+SPLIT = PLAIN.index(b"\n", 300) + 1
+MIXED = PLAIN[:SPLIT] + b"quantum 3\n  process name Late arrival 7 burst 2\n\n" + PLAIN[SPLIT:]
+
+
+@pytest.mark.parametrize('processes', [PLAIN, MIXED], ids=['plain', 'mixed'])
+@pytest.mark.parametrize('chunk_size', [1, 16, 64, 1000])
+def test_chunk_boundaries(processes, chunk_size, monkeypatch):
+    data = b"runfor 50\nuse rr\n" + processes + b"end\nprocess name After arrival 0 burst 1\n"
+    expected = parse_workload(data)
+    monkeypatch.setattr(input_parser, 'CHUNK_SIZE', chunk_size)
+    assert parse_workload(data) == expected
+    assert len(expected.names) == processes.count(b"process name")
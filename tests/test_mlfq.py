@@ -0,0 +1,45 @@
+# MLFQ settings: how levels, quanta and boost are read from a workload, and
+# the settings mlfq_options() refuses. The schedules themselves are pinned down
+# by the mlfq_* fixtures of the parity test.
+
+import pytest
+
+from engine import mlfq_options
+from input_parser import parse_workload, parse_workload_json
+
+HEADER = b"runfor 20\nuse mlfq\n"
+PROCESS = b"process name A arrival 0 burst 5\nend\n"
+
+
+def options(settings):
+    return mlfq_options(parse_workload(HEADER + settings + PROCESS))
+
+
+@pytest.mark.parametrize('settings, expected', [
+    (b"", {'quanta': (1, 2, 4), 'boost': None}),
+    (b"quantum 3\n", {'quanta': (3, 6, 12), 'boost': None}),
+    (b"quantum 2\nlevels 2\n", {'quanta': (2, 4), 'boost': None}),
+    (b"quanta 5,1,7\nboost 10\n", {'quanta': (5, 1, 7), 'boost': 10}),
+    (b"levels 2\nquanta 3,6\n", {'quanta': (3, 6), 'boost': None}),
+])
+def test_settings(settings, expected):
+    assert options(settings) == expected
+
+
+def test_json_settings():
+    workload = parse_workload_json('{"processes": [], "runfor": 5, "use": "mlfq", "quanta": [2, 4], "boost": 3}')
+    assert mlfq_options(workload) == {'quanta': (2, 4), 'boost': 3}
+
+
+@pytest.mark.parametrize('settings, message', [
+    (b"levels 2\nquanta 1,2,3\n", "levels is 2 but 3 quanta are given"),
+    (b"quanta 2,0\n", "quantum of at least 1"),
+    (b"quantum 0\n", "quantum of at least 1"),
+    (b"quantum -1\n", "quantum of at least 1"),
+    (b"levels 0\n", "at least one level"),
+    (b"boost 0\n", "boost must be at least 1"),
+    (b"boost -5\n", "boost must be at least 1"),
+])
+def test_rejected_settings(settings, message):
+    with pytest.raises(ValueError, match=message):
+        options(settings)
@@ -0,0 +1,73 @@
+# online.py reimplements each policy as an incremental Scheduler, so it is held
+# to the engine here: on random workloads, fed in one arrival at a time with
+# extra advance() calls in between, every job has to start and finish exactly
+# when the engine's event function starts and finishes it.
+
+import random
+
+import pytest
+
+from engine import ALGORITHMS, Process, RunState, get_algorithm
+from online import POLICIES, create_scheduler
+
+CASES = 1000
+# Long enough for every process of a random workload to finish
+RUNTIME = 10 ** 6
+
+
+def workload(rnd):
+    # Bursts of 0 are left out: the engine's sjf keeps the original script's
+    # handling of them, which never completes the job
+    processes = [Process(f"P{i}", rnd.randint(0, 30), rnd.randint(1, 12)) for i in range(rnd.randint(1, 12))]
+    quantum = rnd.randint(1, 4)
+    options = {}
+    if rnd.random() < 0.5:
+        options['quanta'] = tuple(rnd.randint(1, 5) for _ in range(rnd.randint(1, 4)))
+    if rnd.random() < 0.5:
+        options['boost'] = rnd.randint(1, 15)
+    return processes, quantum, options
+
+
+def engine_times(processes, algorithm, quantum, options):
+    state = RunState(processes)
+    for _ in get_algorithm(algorithm).events(processes, RUNTIME, state, quantum, **options):
+        pass
+    return {p.name: (state.start_time[pid], state.finish_time[pid]) for pid, p in enumerate(processes)}
+
+
+def online_times(processes, algorithm, quantum, options, rnd):
+    scheduler = create_scheduler(algorithm, quantum, **options)
+    times = {}
+
+    def collect():
+        for event in scheduler.events():
+            if event[1] == 'finished':
+                name, turnaround, response = event[2], event[4], event[5]
+                arrival = by_name[name].arrival
+                times[name] = (arrival + response, arrival + turnaround)
+
+    by_name = {p.name: p for p in processes}
+    for process in sorted(processes, key=lambda p: p.arrival):
+        if process.arrival > scheduler.time and rnd.random() < 0.5:
+            scheduler.advance(rnd.randint(scheduler.time, process.arrival))
+        scheduler.advance(process.arrival)
+        scheduler.submit(process)
+        collect()
+    scheduler.advance()
+    collect()
+    return times
+
+
+def test_every_registered_algorithm_has_a_policy():
+    assert list(POLICIES) == list(ALGORITHMS)
+
+
+@pytest.mark.parametrize('algorithm', list(POLICIES))
+def test_matches_engine(algorithm):
+    for case in range(CASES):
+        rnd = random.Random(case)
+        processes, quantum, options = workload(rnd)
+        if algorithm != 'mlfq':
+            options = {}
+        expected = engine_times(processes, algorithm, quantum, options)
+        assert online_times(processes, algorithm, quantum, options, rnd) == expected, (case, processes, quantum, options)
@@ -0,0 +1,82 @@
+# Output parity with the original scripts.
+#
+# Every expected/<script>/<name>.out file is what <script>.py wrote for
+# fixtures/<name>.in before any of the rewrites (stdout for scripts that print
+# their schedule). Each script is run on a copy of the fixture in a scratch
+# directory and has to reproduce that text byte for byte.
+#
+# scheduler-gpt.py --trace also writes a binary trace, and binary_trace.py has to
+# turn that back into the same text.
+#
+# Inputs the original scripts could not run, such as an rr workload with a
+# quantum below 1 (which never finished), expect the error message printed on
+# stdout instead, and no .out file.
+#
+#   python -m pytest tests
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TESTS_DIR)
+FIXTURES = os.path.join(TESTS_DIR, 'fixtures')
+EXPECTED = os.path.join(TESTS_DIR, 'expected')
+
+# A run that takes longer than this is stuck
+TIMEOUT = 60
+
+# Extra arguments per script, so a run touches nothing outside its scratch directory
+SCRIPTS = {
+    'scheduler-gpt.py': ['--no-cache'],
+    'Bonus.py': ['--format', 'out', '--no-open'],
+    'fifo_scheduler.py': [],
+    'sjf_scheduler.py': [],
+    'rr.py': [],
+}
+
+
+def names(script):
+    return [expected[:-4] for expected in sorted(os.listdir(os.path.join(EXPECTED, script[:-3])))]
+
+
+def cases():
+    return [pytest.param(script, name, id=f"{script[:-3]}-{name}") for script in SCRIPTS for name in names(script)]
+
+
+def run(script, *args, cwd):
+    return subprocess.run([sys.executable, os.path.join(REPO_ROOT, script), *args],
+                          cwd=cwd, capture_output=True, text=True, check=True, timeout=TIMEOUT)
+
+
+def expected_output(script, name):
+    with open(os.path.join(EXPECTED, script[:-3], name + '.out')) as file:
+        return file.read()
+
+
+@pytest.mark.parametrize('script, name', cases())
+def test_output_matches_original(script, name, tmp_path):
+    shutil.copy(os.path.join(FIXTURES, name + '.in'), tmp_path)
+    stdout = run(script, name + '.in', *SCRIPTS[script], cwd=tmp_path).stdout
+
+    output_file = tmp_path / (name + '.out')
+    assert (output_file.read_text() if output_file.exists() else stdout) == expected_output(script, name)
+
+
+@pytest.mark.parametrize('name', names('scheduler-gpt.py'))
+def test_trace_converts_back_to_output(name, tmp_path):
+    shutil.copy(os.path.join(FIXTURES, name + '.in'), tmp_path)
+    stdout = run('scheduler-gpt.py', name + '.in', '--no-cache', '--trace', cwd=tmp_path).stdout
+    expected = expected_output('scheduler-gpt.py', name)
+    if not (tmp_path / (name + '.out')).exists():
+        # A rejected input leaves no trace either
+        assert stdout == expected
+        assert not (tmp_path / (name + '.trace')).exists()
+        return
+
+    assert run('binary_trace.py', name + '.trace', cwd=tmp_path).stdout == expected
+    run('binary_trace.py', name + '.trace', 'converted.out', cwd=tmp_path)
+    assert (tmp_path / 'converted.out').read_text() == expected
@@ -0,0 +1,32 @@
+# The counters Profile.count_events takes from a run's event records.
+
+from engine import Process, RunState, get_algorithm
+from profiling import Profile
+
+
+def counters(processes, algorithm, quantum=None, runtime=30):
+    profile = Profile()
+    events = get_algorithm(algorithm).events(processes, runtime, RunState(processes), quantum)
+    for _ in profile.count_events(events):
+        pass
+    return profile.counters
+
+
+def test_reselecting_the_same_process_is_not_a_preemption():
+    result = counters([Process('A', 0, 5)], 'rr', quantum=1)
+    assert result['selections'] == 5
+    assert result['preemptions'] == 0
+    assert result['context_switches'] == 1
+
+
+def test_preemptions():
+    # B arrives with a shorter burst and takes the CPU from A, which resumes after it
+    result = counters([Process('A', 0, 6), Process('B', 1, 2)], 'sjf')
+    assert result['selections'] == 3
+    assert result['preemptions'] == 1
+    assert result['context_switches'] == 3
+
+
+def test_idle_ticks():
+    result = counters([Process('A', 4, 2)], 'fcfs', runtime=10)
+    assert result['idle_ticks'] == 8
@@ -0,0 +1,106 @@
+# The result cache: what goes into a key, hits and misses, scheduler-gpt.py's
+# --no-cache, and least-recently-used eviction.
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from input_parser import parse_workload
+from result_cache import ResultCache, workload_key
+from test_parity import EXPECTED, FIXTURES, REPO_ROOT, TIMEOUT
+
+RR = b"processcount 2\nrunfor 20\nuse rr\nquantum 2\nprocess name A arrival 0 burst 5\nprocess name B arrival 1 burst 3\nend\n"
+
+
+def key(data):
+    return workload_key(parse_workload(data))
+
+
+def test_key_ignores_layout():
+    relaid = b"use rr\n  runfor   20\nquantum 2\nprocesscount 2\n\nprocess name A arrival 0 burst 5\nprocess name B arrival 1 burst 3\nend\nignored\n"
+    assert key(relaid) == key(RR)
+
+
+def test_key_ignores_quantum_unless_used():
+    fcfs = RR.replace(b"use rr", b"use fcfs")
+    assert key(fcfs) == key(fcfs.replace(b"quantum 2", b"quantum 7"))
+    assert key(RR) != key(RR.replace(b"quantum 2", b"quantum 7"))
+
+
+@pytest.mark.parametrize('change', [(b"burst 5", b"burst 6"), (b"arrival 1", b"arrival 2"), (b"name B", b"name C"), (b"runfor 20", b"runfor 21"), (b"use rr", b"use mlfq")])
+def test_key_changes_with_workload(change):
+    assert key(RR.replace(*change)) != key(RR)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / 'store'))
+    output_file = tmp_path / 'run.out'
+    assert cache.get('missing', str(output_file)) is None
+    assert not output_file.exists()
+
+    output_file.write_text("report\n")
+    cache.put('entry', str(output_file), {'processes': 2})
+    copy = tmp_path / 'copy.out'
+    assert cache.get('entry', str(copy)) == {'processes': 2}
+    assert copy.read_text() == "report\n"
+
+
+def run(tmp_path, *flags):
+    environment = {**os.environ, 'XDG_CACHE_HOME': str(tmp_path / 'cache')}
+    subprocess.run([sys.executable, os.path.join(REPO_ROOT, 'scheduler-gpt.py'), 'rr_gap.in', *flags],
+                   cwd=tmp_path, env=environment, check=True, capture_output=True, timeout=TIMEOUT)
+    return (tmp_path / 'rr_gap.out').read_text()
+
+
+def test_no_cache_flag(tmp_path):
+    shutil.copy(os.path.join(FIXTURES, 'rr_gap.in'), tmp_path)
+    with open(os.path.join(EXPECTED, 'scheduler-gpt', 'rr_gap.out')) as file:
+        expected = file.read()
+    store = tmp_path / 'cache' / 'scheduler-gpt'
+
+    assert run(tmp_path, '--no-cache') == expected
+    assert not store.exists()
+
+    assert run(tmp_path) == expected
+    [cached] = store.glob('*.out')
+    # A second run is served from the store, unless --no-cache is given
+    cached.write_text("from the cache\n")
+    assert run(tmp_path) == "from the cache\n"
+    assert run(tmp_path, '--no-cache') == expected
+
+
+def stored(directory):
+    return sorted(name[:-len('.json')] for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def fill(tmp_path, names, max_bytes):
+    # A store of entries of about 1 KB, holding `names` from least to most recently used
+    directory = str(tmp_path / 'store')
+    output_file = tmp_path / 'run.out'
+    output_file.write_text("x" * 1000)
+    cache = ResultCache(directory, max_bytes)
+    for age, name in enumerate(names):
+        cache.put(name, str(output_file), {})
+        os.utime(os.path.join(directory, name + '.json'), (age, age))
+    return cache, directory, str(output_file)
+
+
+def test_lru_eviction(tmp_path):
+    # Room for three entries, also once trimmed to EVICT_TO of max_bytes
+    cache, directory, output_file = fill(tmp_path, ['a', 'b', 'c'], 3900)
+    # Using a refreshes it, so b is now the least recently used
+    assert cache.get('a', str(tmp_path / 'copy.out')) == {}
+    cache.put('d', output_file, {})
+    assert stored(directory) == ['a', 'c', 'd']
+
+
+def test_rewriting_an_entry_does_not_grow_the_store(tmp_path):
+    # Room for three entries, but not once trimmed, so any eviction pass removes one
+    cache, directory, output_file = fill(tmp_path, ['a', 'b', 'c'], 3500)
+    for _ in range(5):
+        cache.put('c', output_file, {})
+    assert stored(directory) == ['a', 'b', 'c']
+    assert cache._size == sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
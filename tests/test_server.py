@@ -0,0 +1,66 @@
+# server.py answers a workload with the same text scheduler-gpt.py writes to the
+# .out file, streamed back from its worker, and a bad workload with an error line.
+
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from engine import RunState, make_processes
+from input_parser import parse_workload
+from report import write_schedule
+from test_parity import EXPECTED, FIXTURES, REPO_ROOT, TIMEOUT
+
+
+@pytest.fixture(scope='module')
+def server_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('server') / 'server.sock')
+    server = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, 'server.py'), '--unix', path, '--workers', '1'],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        assert server.stdout.readline().startswith("Serving on")
+        yield path
+    finally:
+        # Interrupted like a server stopped with Ctrl-C, so it shuts its worker pool down
+        server.send_signal(signal.SIGINT)
+        server.wait(TIMEOUT)
+
+
+def request(path, data):
+    with socket.socket(socket.AF_UNIX) as client:
+        client.settimeout(TIMEOUT)
+        client.connect(path)
+        client.sendall(data)
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := client.recv(1 << 16):
+            chunks.append(chunk)
+    return b''.join(chunks).decode()
+
+
+def read(*parts):
+    with open(os.path.join(*parts), 'rb') as file:
+        return file.read()
+
+
+@pytest.mark.parametrize('name', ['fcfs_busy', 'sjf_preempt', 'rr_gap', 'mlfq_boost'])
+def test_output_matches_out_file(server_path, name):
+    assert request(server_path, read(FIXTURES, name + '.in')) == read(EXPECTED, 'scheduler-gpt', name + '.out').decode()
+
+
+def test_long_output(server_path):
+    # Enough text for many pipe messages
+    data = b"runfor 100000\nuse rr\nquantum 1\nprocess name A arrival 0 burst 40000\nprocess name B arrival 5 burst 40000\nend\n"
+    workload = parse_workload(data)
+    processes = make_processes(workload)
+    expected = io.StringIO()
+    write_schedule(expected, processes, workload.runfor, workload.algorithm, workload.quantum, RunState(processes))
+    assert request(server_path, data) == expected.getvalue()
+
+
+def test_error_line(server_path):
+    assert request(server_path, read(FIXTURES, 'rr_quantum_zero.in')) == "error: ValueError: quantum must be at least 1, not 0\n"